@@ -12,4 +12,5 @@ class SensorSearchConfig(AppConfig):
     verbose_name = "Sensor Search Option Set Plugin"
 
     def ready(self):
+        from . import checks  # noqa: F401
         from .signals import signal_handlers  # noqa: F401
@@ -0,0 +1,92 @@
+import logging
+import time
+from hashlib import sha1
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY_PREFIX = "rdmo_sensorsearch"
+# entries that other processes invalidate expire after this many seconds
+# if the cache is not shared between the worker processes
+LOCAL_CACHE_TIMEOUT = 60
+
+
+def get_cache():
+    """
+    Returns the Django cache used by the plugin.
+
+    The cache alias can be set with `SENSORS_SEARCH_CACHE_ALIAS` in the
+    settings and defaults to the `default` cache.
+    """
+    try:
+        cache_alias = settings.SENSORS_SEARCH_CACHE_ALIAS
+    except AttributeError:
+        cache_alias = "default"
+    return caches[cache_alias]
+
+
+def is_shared_cache() -> bool:
+    """
+    Returns whether the plugin cache is shared by all worker processes.
+
+    The local memory cache, the default of Django and RDMO, is private to
+    one process: invalidations, counters and budgets stored in it only reach
+    the process that wrote them.
+    """
+    return not isinstance(get_cache(), (LocMemCache, DummyCache))
+
+
+def get_invalidated_timeout(timeout: int) -> int:
+    """
+    Returns the timeout for cache entries that are invalidated explicitly,
+    e.g. when a value is saved. In a process-local cache, the other workers
+    never see the invalidation, so the entries expire after at most
+    `LOCAL_CACHE_TIMEOUT` seconds there.
+    """
+    return timeout if is_shared_cache() else min(timeout, LOCAL_CACHE_TIMEOUT)
+
+
+def make_cache_key(namespace: str, *parts) -> str:
+    """
+    Builds a cache key from a namespace and arbitrary parts.
+
+    The parts are hashed, so that URLs, search terms and other free text can
+    be used without running into the key restrictions of memcached.
+    """
+    digest = sha1("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f"{CACHE_KEY_PREFIX}:{namespace}:{digest}"
+
+
+def get_version(namespace: str, *parts) -> int:
+    """
+    Returns the current version counter for a namespace and parts.
+
+    Cache entries that include the version in their key become unreachable
+    as soon as the version is bumped. A missing counter is initialised with
+    the current time, so that a counter evicted from the cache never falls
+    back to a version that was used before.
+    """
+    cache = get_cache()
+    version_key = make_cache_key(f"{namespace}-version", *parts)
+    version = cache.get(version_key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(version_key, version, None):
+            version = cache.get(version_key, version)
+    return version
+
+
+def bump_version(namespace: str, *parts) -> None:
+    """
+    Bumps the version counter for a namespace and parts.
+    """
+    cache = get_cache()
+    version_key = make_cache_key(f"{namespace}-version", *parts)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, time.time_ns(), None)
@@ -0,0 +1,20 @@
+from django.core.checks import Warning, register
+
+from rdmo_sensorsearch.cache import LOCAL_CACHE_TIMEOUT, is_shared_cache
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    if is_shared_cache():
+        return []
+    return [
+        Warning(
+            "The sensor search cache is local to each process.",
+            hint=(
+                "Configure a cache shared by all workers (e.g. Redis or Memcached) and select it with "
+                f"SENSORS_SEARCH_CACHE_ALIAS. Without it, invalidated entries expire after {LOCAL_CACHE_TIMEOUT} "
+                "seconds, and popularity counts and prefetch budgets are kept per process."
+            ),
+            id="rdmo_sensorsearch.W001",
+        )
+    ]
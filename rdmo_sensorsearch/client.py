@@ -1,20 +1,31 @@
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
 from functools import cache
 
 from django.conf import settings
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from rdmo import __version__
 
+from rdmo_sensorsearch.cache import get_cache, make_cache_key
+
 logger = logging.getLogger(__name__)
 
+RESPONSE_CACHE_TIMEOUT = 600
+HTTP_POOL_SIZE = 16
+
+_REFRESH_RESPONSES: ContextVar[bool] = ContextVar("rdmo_sensorsearch_refresh_responses", default=False)
+
 
 def fetch_json(url: str) -> dict | list:
     timeout = get_request_timeout()
     logger.debug("Requesting JSON from %s with timeout=%s", url, timeout)
     try:
-        response = requests.get(
+        response = get_session().get(
             url,
             headers={"User-Agent": get_user_agent()},
             timeout=timeout,
@@ -41,6 +52,105 @@ def fetch_json(url: str) -> dict | list:
         return {"errors": [str(e)]}
 
 
+def fetch_cached_json(url: str) -> dict | list:
+    """
+    Fetches JSON like `fetch_json`, but answers repeated requests for the same
+    URL from the response cache. The providers use it for their searches and
+    lookups; the handlers fetch the records they write into projects with
+    `fetch_json`.
+
+    Only successful responses are cached, for `SENSORS_SEARCH_RESPONSE_CACHE_TIMEOUT`
+    seconds (default 600, 0 disables the cache). Within `refreshing_responses()`
+    the cache is bypassed and overwritten with the fresh response.
+    """
+    timeout = get_response_cache_timeout()
+    if not timeout:
+        return fetch_json(url)
+
+    cache_key = make_cache_key("response", url)
+    if not _REFRESH_RESPONSES.get():
+        cached = get_cache().get(cache_key)
+        if cached is not None:
+            logger.debug("Using cached response for %s", url)
+            return cached
+
+    json_data = fetch_json(url)
+    if not (isinstance(json_data, dict) and "errors" in json_data):
+        get_cache().set(cache_key, json_data, timeout)
+    return json_data
+
+
+def fetch_json_if_modified(url: str, validators: dict[str, str] | None = None) -> tuple[dict | list | None, dict[str, str]]:
+    """
+    Fetches JSON conditionally, for revalidating a locally kept copy.
+
+    Args:
+        url (str):                      The URL to fetch.
+        validators (dict, optional):    The `ETag` and `Last-Modified` headers
+                                        of the kept copy.
+
+    Returns:
+        tuple: The JSON data, or None if the copy is still valid, and the
+               validators of the response. The data is an `{"errors": [...]}`
+               dictionary if the request failed.
+    """
+    validators = validators or {}
+    headers = {"User-Agent": get_user_agent()}
+    if validators.get("ETag"):
+        headers["If-None-Match"] = validators["ETag"]
+    if validators.get("Last-Modified"):
+        headers["If-Modified-Since"] = validators["Last-Modified"]
+
+    logger.debug("Revalidating JSON from %s with validators=%s", url, validators)
+    try:
+        response = get_session().get(url, headers=headers, timeout=get_request_timeout())
+        if response.status_code == 304:
+            logger.debug("%s was not modified", url)
+            return None, validators
+        response.raise_for_status()
+        return response.json(), {key: response.headers[key] for key in ("ETag", "Last-Modified") if response.headers.get(key)}
+    except (requests.exceptions.RequestException, ValueError) as e:
+        logger.error("Request failed for %s: %s", url, e)
+        return {"errors": [str(e)]}, validators
+
+
+@contextmanager
+def refreshing_responses() -> Iterator[None]:
+    token = _REFRESH_RESPONSES.set(True)
+    try:
+        yield
+    finally:
+        _REFRESH_RESPONSES.reset(token)
+
+
+def is_refreshing_responses() -> bool:
+    """
+    Returns whether the caller runs within `refreshing_responses()`.
+    """
+    return _REFRESH_RESPONSES.get()
+
+
+@cache
+def get_session() -> requests.Session:
+    """
+    Returns the HTTP session shared by all requests of the process, so that
+    connections to the registries are kept alive and reused.
+
+    Each host gets a pool of up to `SENSORS_SEARCH_HTTP_POOL_SIZE` connections
+    (default 16), enough for the concurrent fetches of all handlers.
+    """
+    try:
+        pool_size = settings.SENSORS_SEARCH_HTTP_POOL_SIZE
+    except AttributeError:
+        pool_size = HTTP_POOL_SIZE
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
 @cache
 def get_user_agent():
     """
@@ -68,3 +178,11 @@ def get_request_timeout():
         return settings.SENSORS_SEARCH_PROVIDER_REQUEST_TIMEOUT
     except AttributeError:
         return 10
+
+
+@cache
+def get_response_cache_timeout():
+    try:
+        return settings.SENSORS_SEARCH_RESPONSE_CACHE_TIMEOUT
+    except AttributeError:
+        return RESPONSE_CACHE_TIMEOUT
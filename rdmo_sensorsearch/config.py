@@ -6,7 +6,9 @@
 import logging
 import os
 import sys
-from functools import cache
+import threading
+from dataclasses import dataclass, replace
+from hashlib import sha256
 from pathlib import Path
 from typing import Any
 
@@ -62,7 +64,97 @@ def get_config_file_path() -> str:
     return config_file_path
 
 
-@cache
+@dataclass(frozen=True)
+class ConfigFile:
+    path: str
+    mtime_ns: int
+    digest: str
+    configuration: dict[str, Any]
+
+
+_config_file: ConfigFile | None = None
+_config_file_lock = threading.Lock()
+
+
+def load_config_file() -> ConfigFile:
+    """
+    Loads the sensor search provider configuration file, reusing the parsed
+    configuration as long as the file is unchanged.
+
+    The modification time of the file is checked on every call. Only when it
+    changed, the file is read again and its hash compared, so touching the
+    file without changing it does not trigger a rebuild. If a changed file
+    cannot be parsed, the previous configuration stays active.
+
+    Returns:
+        ConfigFile: The path, modification time, hash and parsed content of
+                    the configuration file.
+
+    Raises:
+        FileNotFoundError:          If the configuration file is not found.
+        PermissionError:            If there are permission issues accessing
+                                    the configuration file.
+        tomllib.TOMLDecodeError:    If the configuration file cannot be
+                                    decoded as valid TOML.
+    """
+    global _config_file
+
+    config_file_path = get_config_file_path()
+    try:
+        mtime_ns = os.stat(config_file_path).st_mtime_ns
+    except (FileNotFoundError, PermissionError) as e:
+        logger.error("Cannot open configuration file: %s", config_file_path)
+        raise e from e
+
+    current = _config_file
+    if current is not None and current.path == config_file_path and current.mtime_ns == mtime_ns:
+        return current
+
+    with _config_file_lock:
+        current = _config_file
+        if current is not None and current.path == config_file_path and current.mtime_ns == mtime_ns:
+            return current
+
+        logger.debug("Try to open configuration file: %s", config_file_path)
+        try:
+            with open(config_file_path, "rb") as config_file:
+                content = config_file.read()
+        except (FileNotFoundError, PermissionError) as e:
+            logger.error("Cannot open configuration file: %s", config_file_path)
+            raise e from e
+
+        digest = sha256(content).hexdigest()
+        if current is not None and current.path == config_file_path and current.digest == digest:
+            _config_file = replace(current, mtime_ns=mtime_ns)
+            return _config_file
+
+        try:
+            configuration = tomllib.loads(content.decode("utf-8"))
+        except (tomllib.TOMLDecodeError, UnicodeDecodeError) as e:
+            if current is not None and current.path == config_file_path:
+                logger.exception(
+                    "Failed to decode changed configuration file %s, keeping the previous configuration",
+                    config_file_path,
+                )
+                _config_file = replace(current, mtime_ns=mtime_ns)
+                return _config_file
+            logger.error("Failed to decode configuration file: %s", config_file_path)
+            raise e from e
+
+        logger.debug(
+            "Loaded sensor search configuration from %s with top-level keys: %s",
+            config_file_path,
+            sorted(configuration.keys()),
+        )
+        _config_file = ConfigFile(
+            path=config_file_path,
+            mtime_ns=mtime_ns,
+            digest=digest,
+            configuration=configuration,
+        )
+        return _config_file
+
+
 def load_config():
     """
     Loads the sensor search provider configuration from a TOML file.
@@ -71,8 +163,8 @@ def load_config():
     TOML file. It first tries to retrieve the configuration file name and path
     from settings variables. If those are not defined, it uses default values.
     The function then checks for environment variables that might override the
-    file name or path. Finally, it opens the configuration file using `tomllib`
-    and returns the parsed configuration as a dictionary.
+    file name or path. The parsed configuration is reused until the file
+    changes, see `load_config_file`.
 
     Returns:
         dict: A dictionary containing the loaded configuration settings.
@@ -85,21 +177,4 @@ def load_config():
                                     decoded as valid TOML.
 
     """
-    config_file_path = get_config_file_path()
-    logger.debug("Try to open configuration file: %s", config_file_path)
-
-    try:
-        with open(config_file_path, "rb") as config_file:
-            configuration = tomllib.load(config_file)
-            logger.debug(
-                "Loaded sensor search configuration from %s with top-level keys: %s",
-                config_file_path,
-                sorted(configuration.keys()),
-            )
-            return configuration
-    except (FileNotFoundError, PermissionError) as e:
-        logger.error("Cannot open configuration file: %s", config_file_path)
-        raise e from e
-    except tomllib.TOMLDecodeError as e:
-        logger.error("Failed to decode configuration file: %s", config_file_path)
-        raise e from e
+    return load_config_file().configuration
@@ -0,0 +1,149 @@
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+UNAVAILABLE_BACKOFF = 30
+
+_in_daemon = False
+_unavailable_until = 0.0
+_unavailable_lock = threading.Lock()
+
+
+class DaemonError(Exception):
+    """
+    Raised when the sensor search daemon cannot be reached or fails to answer
+    a request. Callers fall back to doing the work in-process.
+    """
+
+
+def get_daemon_socket_path() -> str | None:
+    try:
+        socket_path = settings.SENSORS_SEARCH_DAEMON_SOCKET
+    except AttributeError:
+        socket_path = None
+    return os.getenv("SENSORS_SEARCH_DAEMON_SOCKET", socket_path) or None
+
+
+def is_daemon_enabled() -> bool:
+    """
+    Returns whether requests should be forwarded to the daemon: a socket is
+    configured, this process is not the daemon itself and the daemon did not
+    fail within the last `UNAVAILABLE_BACKOFF` seconds.
+    """
+    return not _in_daemon and get_daemon_socket_path() is not None and time.monotonic() >= _unavailable_until
+
+
+def call_daemon(operation: str, **params):
+    """
+    Sends one request to the daemon and returns its result.
+
+    Raises:
+        DaemonError: If the daemon is not reachable or the request failed.
+            If the daemon is not reachable or its answer cannot be read, it
+            is not asked again for `UNAVAILABLE_BACKOFF` seconds.
+    """
+    from rdmo_sensorsearch.client import get_request_timeout
+
+    socket_path = get_daemon_socket_path()
+    request = json.dumps({"op": operation, "params": params}).encode("utf-8") + b"\n"
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            # the daemon may have to query several backends for one request
+            connection.settimeout(get_request_timeout() * 3)
+            connection.connect(socket_path)
+            connection.sendall(request)
+            with connection.makefile("rb") as stream:
+                line = stream.readline(MAX_MESSAGE_SIZE)
+        response = json.loads(line)
+        if not isinstance(response, dict):
+            raise ValueError(f"Unexpected response: {response!r}")
+    except (OSError, ValueError) as e:
+        _back_off()
+        logger.warning("Sensor search daemon at %s is unavailable, working in-process: %s", socket_path, e)
+        raise DaemonError(str(e)) from e
+
+    if "error" in response:
+        # the daemon works, only this request failed
+        raise DaemonError(response["error"])
+    return response.get("result")
+
+
+def _back_off() -> None:
+    global _unavailable_until
+
+    with _unavailable_lock:
+        _unavailable_until = time.monotonic() + UNAVAILABLE_BACKOFF
+
+
+def _get_options(config_key: str, search: str | None = None, project_id=None, user_id=None):
+    from rdmo.projects.models import Project
+
+    from rdmo_sensorsearch.providers.meta_provider import META_PROVIDERS
+
+    meta_provider = META_PROVIDERS[config_key](config_key, "", "")
+    project = Project.objects.select_related("catalog").filter(pk=project_id).first() if project_id is not None else None
+    user = SimpleNamespace(pk=user_id) if user_id is not None else None
+    return meta_provider.get_options(project, search=search, user=user)
+
+
+OPERATIONS = {
+    "get_options": _get_options,
+}
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        close_old_connections()
+        try:
+            request = json.loads(self.rfile.readline(MAX_MESSAGE_SIZE))
+            operation = OPERATIONS[request["op"]]
+            response = {"result": operation(**request.get("params", {}))}
+        except Exception as e:
+            logger.exception("Sensor search daemon request failed")
+            response = {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            close_old_connections()
+
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class SensorSearchDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves the option searches of all RDMO workers of a host over a Unix
+    socket, so that they share one response cache, one set of loaded
+    snapshots and indexes and one connection pool. Other backend fetches stay
+    in the workers.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, DaemonRequestHandler)
+        os.chmod(socket_path, 0o660)
+
+    def serve_forever(self, *args, **kwargs):
+        global _in_daemon
+
+        _in_daemon = True
+        try:
+            super().serve_forever(*args, **kwargs)
+        finally:
+            _in_daemon = False
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
@@ -1,11 +1,80 @@
+import contextvars
 import logging
-from collections.abc import Callable
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from typing import Any
 from urllib.parse import urlsplit
 
+from django.conf import settings
+
+from rdmo_sensorsearch.cache import bump_version, get_cache, get_version, make_cache_key
+from rdmo_sensorsearch.client import is_refreshing_responses
+from rdmo_sensorsearch.handlers.parser import CompiledAttributeMapping, compile_attribute_mapping
+
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_FETCHES = 4
+DETAIL_CACHE_TIMEOUT = 0
+DETAIL_CACHE_NAMESPACE = "handler-detail"
+
+_backend_semaphores: dict[tuple[str, int], threading.BoundedSemaphore] = {}
+_backend_semaphores_lock = threading.Lock()
+
+
+@dataclass
+class _SyncMemo:
+    results: dict[tuple, Future] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+_SYNC_MEMO: contextvars.ContextVar[_SyncMemo | None] = contextvars.ContextVar("rdmo_sensorsearch_sync_memo", default=None)
+
+
+@contextmanager
+def sync_memo() -> Iterator[None]:
+    """
+    Keeps the results of `GenericSearchHandler.memoized` until the block ends,
+    e.g. for one device set sync. Nested blocks share the outer memo. Worker
+    threads see the memo if they run in a copy of the context.
+    """
+    if _SYNC_MEMO.get() is not None:
+        yield
+        return
+
+    token = _SYNC_MEMO.set(_SyncMemo())
+    try:
+        yield
+    finally:
+        _SYNC_MEMO.reset(token)
+
+
+def get_detail_cache_timeout() -> int:
+    try:
+        return settings.SENSORS_SEARCH_DETAIL_CACHE_TIMEOUT
+    except AttributeError:
+        return DETAIL_CACHE_TIMEOUT
+
+
+def invalidate_details(handler_name: str, base_url: str, id_: str | None = None) -> None:
+    """
+    Drops the cached detail payload of one record, or of all records of the
+    backend if `id_` is None, e.g. after the record was changed. The payloads
+    are built from live responses, so they are fetched again afterwards.
+
+    Args:
+        handler_name (str): The class name of the handler.
+        base_url (str):     The base URL of the handler's backend.
+        id_ (str, optional): The id of the record.
+    """
+    if id_ is None:
+        bump_version(DETAIL_CACHE_NAMESPACE, handler_name, base_url)
+        return
+    version = get_version(DETAIL_CACHE_NAMESPACE, handler_name, base_url)
+    get_cache().delete(make_cache_key(DETAIL_CACHE_NAMESPACE, handler_name, base_url, version, id_))
+
 
 @dataclass
 class CollectionAssignment:
@@ -28,8 +97,32 @@ class GenericSearchHandler:
     Derived classes are used to gather additional information from the
     implemented API provider and map them to attributes in a catalog using
     JMESPath.
+
+    Independent sub-resources of a record can be fetched in parallel with
+    `fetch_concurrently`. At most `max_concurrent_fetches` of these fetches
+    run at the same time per backend (`base_url_origin`), across all handler
+    instances of the process.
+
+    Handlers fetch the records they write into projects live. They can keep
+    the merged payload of a record, before it is mapped, with
+    `get_cached_detail` and `set_cached_detail` for `detail_cache_timeout`
+    seconds (`SENSORS_SEARCH_DETAIL_CACHE_TIMEOUT` if None, which defaults to
+    0 and disables it).
+
+    The `attribute_mapping` is compiled once. With `combine_attribute_mapping`
+    its expressions are evaluated as one multi-select expression, which pays
+    off for large mappings whose expressions rarely fail.
     """
 
+    max_concurrent_fetches = MAX_CONCURRENT_FETCHES
+    # handlers resolving one record with a few requests can be prefetched
+    # speculatively for search results
+    prefetchable = False
+    combine_attribute_mapping = False
+    detail_cache_timeout: int | None = None
+    # deprecated configuration keys, mapped to the attributes replacing them
+    renamed_kwargs: dict[str, str] = {}
+
     def __init__(
         self,
         attribute_mapping=None,
@@ -50,12 +143,18 @@ class GenericSearchHandler:
         """
         self._id_prefix = id_prefix
         self._base_url = base_url
+        self._compiled_attribute_mapping = None
 
         if attribute_mapping is not None:
             self.attribute_mapping = attribute_mapping  # must be set via the setter
         else:
             self._attribute_mapping = None  # internal default
 
+        for old_key, new_key in self.renamed_kwargs.items():
+            if old_key in kwargs:
+                logger.warning("%s: `%s` is deprecated, use `%s` instead", type(self).__name__, old_key, new_key)
+                kwargs.setdefault(new_key, kwargs.pop(old_key))
+
         for key, value in kwargs.items():
             setattr(self, key, value)
 
@@ -100,8 +199,124 @@ class GenericSearchHandler:
         if not isinstance(mapping, dict):
             raise TypeError("attribute_mapping must be a dictionary")
         self._attribute_mapping = mapping
+        self._compiled_attribute_mapping = None
+
+    @property
+    def compiled_attribute_mapping(self) -> CompiledAttributeMapping:
+        if self._compiled_attribute_mapping is None:
+            self._compiled_attribute_mapping = compile_attribute_mapping(
+                self.attribute_mapping, combined=self.combine_attribute_mapping
+            )
+        return self._compiled_attribute_mapping
 
     @property
     def base_url_origin(self) -> str:
         parsed = urlsplit(self.base_url)
         return f"{parsed.scheme}://{parsed.netloc}"
+
+    @property
+    def caches_details(self) -> bool:
+        return bool(self._detail_cache_timeout())
+
+    def get_cached_detail(self, id_: str) -> Any | None:
+        """
+        Returns the cached detail payload of a record, or None if it is not
+        cached (or being refreshed).
+        """
+        if not self._detail_cache_timeout() or is_refreshing_responses():
+            return None
+        payload = get_cache().get(self._detail_cache_key(id_))
+        if payload is not None:
+            logger.debug("Using cached %s detail payload for %s", type(self).__name__, id_)
+        return payload
+
+    def set_cached_detail(self, id_: str, payload: Any) -> None:
+        """
+        Caches the detail payload of a record. Payloads with errors are not
+        cached.
+        """
+        timeout = self._detail_cache_timeout()
+        if timeout and not (isinstance(payload, dict) and "errors" in payload):
+            get_cache().set(self._detail_cache_key(id_), payload, timeout)
+
+    def invalidate_detail(self, id_: str | None = None) -> None:
+        """
+        Drops the cached detail payload of a record, or of all records of the
+        handler's backend if `id_` is None.
+        """
+        invalidate_details(type(self).__name__, self.base_url, id_)
+
+    def fetch_concurrently(self, fetches: dict[str, Callable[[], Any]]) -> dict[str, Any]:
+        """
+        Runs independent fetches in parallel and returns their results by key.
+
+        The fetches run in copies of the caller's context, so context
+        variables like `refreshing_responses()` apply to them as well. A
+        failing fetch is logged and its result is an `{"errors": [...]}`
+        dictionary, like a failed `fetch_json`, so that the other results can
+        still be used.
+
+        Args:
+            fetches (dict): Callables without arguments by result key.
+
+        Returns:
+            dict: The results by the keys of `fetches`.
+        """
+        if len(fetches) < 2:
+            return {key: self._run_fetch(key, fetch) for key, fetch in fetches.items()}
+
+        with ThreadPoolExecutor(max_workers=min(len(fetches), self.max_concurrent_fetches)) as executor:
+            futures = {
+                key: executor.submit(contextvars.copy_context().run, self._run_fetch, key, fetch)
+                for key, fetch in fetches.items()
+            }
+            return {key: future.result() for key, future in futures.items()}
+
+    def memoized(self, key: tuple, fetch: Callable[[], Any]) -> Any:
+        """
+        Returns the result of `fetch`, memoized by the handler's backend and
+        the key within a `sync_memo()` block. Outside of such a block the
+        fetch runs every time.
+        """
+        memo = _SYNC_MEMO.get()
+        if memo is None:
+            return fetch()
+
+        memo_key = (type(self).__name__, self.base_url, *key)
+        with memo.lock:
+            future = memo.results.get(memo_key)
+            is_owner = future is None
+            if is_owner:
+                future = memo.results[memo_key] = Future()
+
+        # concurrent callers wait for the first one instead of fetching again
+        if is_owner:
+            try:
+                future.set_result(fetch())
+            except Exception as e:
+                future.set_exception(e)
+        return future.result()
+
+    def _detail_cache_timeout(self) -> int:
+        return get_detail_cache_timeout() if self.detail_cache_timeout is None else self.detail_cache_timeout
+
+    def _detail_cache_key(self, id_: str) -> str:
+        handler_name = type(self).__name__
+        version = get_version(DETAIL_CACHE_NAMESPACE, handler_name, self.base_url)
+        return make_cache_key(DETAIL_CACHE_NAMESPACE, handler_name, self.base_url, version, id_)
+
+    def _run_fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        with self._backend_semaphore():
+            try:
+                return fetch()
+            except Exception as e:
+                logger.exception("%s failed to fetch %s", type(self).__name__, key)
+                return {"errors": [str(e)]}
+
+    def _backend_semaphore(self) -> threading.BoundedSemaphore:
+        semaphore_key = (self.base_url_origin, self.max_concurrent_fetches)
+        with _backend_semaphores_lock:
+            semaphore = _backend_semaphores.get(semaphore_key)
+            if semaphore is None:
+                semaphore = _backend_semaphores[semaphore_key] = threading.BoundedSemaphore(self.max_concurrent_fetches)
+            return semaphore
@@ -18,8 +18,9 @@ class HandlerInstanceData:
     catalog_uri: str
 
 
-def build_handlers_by_catalog() -> dict:
-    config = load_config()
+def build_handlers_by_catalog(config: dict | None = None) -> dict:
+    if config is None:
+        config = load_config()
     handler_configs = config.get("handlers", {})
     handlers_by_catalog: dict = {}
 
@@ -72,6 +73,7 @@ def build_handlers_by_catalog() -> dict:
                         attribute_mapping=attribute_mapping,
                         **catalog_extra_kwargs,
                     )
+                    _validate_attribute_mapping(handler_name, instance)
                     hid = HandlerInstanceData(
                         id_prefix=instance.id_prefix,
                         handler=instance,
@@ -100,6 +102,7 @@ def build_handlers_by_catalog() -> dict:
                         **backend_extra_kwargs,
                         **catalog_extra_kwargs,
                     )
+                    _validate_attribute_mapping(handler_name, instance)
                     hid = HandlerInstanceData(
                         id_prefix=instance.id_prefix,
                         handler=instance,
@@ -111,3 +114,19 @@ def build_handlers_by_catalog() -> dict:
                     logger.error("Failed to instantiate handler %s with id_prefix=%s: %s", handler_name, id_prefix, e)
 
     return handlers_by_catalog
+
+
+def _validate_attribute_mapping(handler_name: str, handler: GenericSearchHandler) -> None:
+    """
+    Compiles the attribute mapping of a new handler, so invalid expressions
+    are reported at startup and not on the first post_save.
+    """
+    errors = handler.compiled_attribute_mapping.errors
+    if errors:
+        logger.warning(
+            "Handler %s with id_prefix=%s ignores %s invalid attribute mapping expression(s): %s",
+            handler_name,
+            handler.id_prefix,
+            len(errors),
+            ", ".join(errors),
+        )
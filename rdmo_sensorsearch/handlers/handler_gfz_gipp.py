@@ -23,6 +23,7 @@ class GeophysicalInstrumentPoolPotsdamHandler(GenericSearchHandler):
     base_url = "https://gipp.gfz-potsdam.de/instruments/rest"
 
     json_url = "{base_url}/{id}.json"
+    prefetchable = True
 
     def handle(self, id_, instance=None):
         """
@@ -37,6 +38,9 @@ class GeophysicalInstrumentPoolPotsdamHandler(GenericSearchHandler):
 
         """
 
-        data = fetch_json(self.json_url.format(base_url=self.base_url, id=id_))
+        data = self.get_cached_detail(id_)
+        if data is None:
+            data = fetch_json(self.json_url.format(base_url=self.base_url, id=id_))
+            self.set_cached_detail(id_, data)
         logger.debug("data: %s", data)
-        return map_jamespath_to_attribute_uri(self.attribute_mapping, data)
+        return map_jamespath_to_attribute_uri(self.compiled_attribute_mapping, data)
@@ -1,12 +1,47 @@
 import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
 from urllib.parse import urlsplit
 
-from rdmo_sensorsearch.client import fetch_json
+from rdmo_sensorsearch.client import fetch_json, fetch_json_if_modified
 from rdmo_sensorsearch.handlers.base import GenericSearchHandler
 from rdmo_sensorsearch.handlers.parser import map_jamespath_to_attribute_uri
 
 logger = logging.getLogger(__name__)
 
+UNITS_CACHE_TIMEOUT = 24 * 60 * 60
+UNITS_RETRY_BACKOFF = 60
+
+
+@dataclass
+class UnitLookup:
+    """
+    The `@uuid` to code lookup of the units of one O2A Registry, with the
+    validators of the response it was built from. After a failed
+    revalidation, the next one waits until `retry_at`. A lookup that could
+    not be built at all is kept as an incomplete placeholder for the backoff.
+    """
+
+    codes: dict[str, str]
+    validators: dict[str, str]
+    checked_at: float
+    retry_at: float = 0.0
+    complete: bool = True
+
+    def get_codes(self) -> dict:
+        if not self.complete:
+            return {"errors": ["The units of the registry are not available"]}
+        return self.codes
+
+
+_unit_lookups: dict[str, UnitLookup] = {}
+# one lock per units URL, so a slow registry only blocks its own handlers
+_unit_lookup_locks: dict[str, threading.Lock] = {}
+_unit_lookups_lock = threading.Lock()
+
 
 class O2ARegistrySearchHandler(GenericSearchHandler):
     """
@@ -19,6 +54,10 @@ class O2ARegistrySearchHandler(GenericSearchHandler):
     3. Units to add them to the parameters
     4. Global units list (for parameter unit lookup)
 
+    The global units list rarely changes. It is kept as a prebuilt lookup per
+    process and `base_url`, which is revalidated with a conditional request
+    after `units_cache_timeout` seconds (default one day).
+
      base_url (str, optional):           The base URL for API requests
                                                 to the O2A Registry. Defaults
                                                 to 'https://registry.o2a-data.de/rest/v2'.
@@ -27,12 +66,14 @@ class O2ARegistrySearchHandler(GenericSearchHandler):
     id_prefix = "o2aregistry"
     base_url = "https://registry.o2a-data.de/rest/v2"
     sync_device_detail_blocks = True
+    prefetchable = True
 
     # URL templates
     item_url = "{base_url}/items/{id}"
     contacts_url = "{base_url}/items/{id}/contacts"
     parameters_url = "{base_url}/items/{id}/parameters"
     units_url = "{base_url}/units"
+    units_cache_timeout = UNITS_CACHE_TIMEOUT
     item_api_link_template = "{base_url}/items/{id}"
     item_frontend_link_template = "{base_url_origin}/items/{id}"
     device_link_attribute_uri = "https://rdmo.nfdi4earth.de/terms/domain/dataset/usage_technology/device-link"
@@ -69,29 +110,47 @@ class O2ARegistrySearchHandler(GenericSearchHandler):
             dict: A dictionary containing the mapped values from the O2A
                   REGISTRY response.
 
+        """
+        data = self.get_cached_detail(id_)
+        if data is None:
+            data = self._fetch_detail(id_)
+
+        logger.debug("data: %s", data)
+        mapped_data = map_jamespath_to_attribute_uri(self.compiled_attribute_mapping, data)
+        self.set_item_link(mapped_data, data)
+        return mapped_data
+
+    def _fetch_detail(self, id_) -> dict:
+        """
+        Fetches an item with its contacts and parameters into one payload and
+        caches it if all parts were fetched.
         """
         base_url = self.base_url
-        # basic data
-        data = fetch_json(self.item_url.format(base_url=base_url, id=id_))
-        # contacts
-        contacts_data = fetch_json(self.contacts_url.format(base_url=base_url, id=id_))
-        # parameters
-        parameters_data = fetch_json(self.parameters_url.format(base_url=base_url, id=id_))
-        # units
-        units_data = fetch_json(self.units_url.format(base_url=base_url))
+        # basic data, contacts, parameters and units are independent
+        results = self.fetch_concurrently(
+            {
+                "item": partial(fetch_json, self.item_url.format(base_url=base_url, id=id_)),
+                "contacts": partial(fetch_json, self.contacts_url.format(base_url=base_url, id=id_)),
+                "parameters": partial(fetch_json, self.parameters_url.format(base_url=base_url, id=id_)),
+                "units": self.get_unit_lookup,
+            }
+        )
+        data = results["item"]
+        contacts_data = results["contacts"]
+        parameters_data = results["parameters"]
+        unit_lookup = results["units"] if "errors" not in results["units"] else {}
 
         # extend basic data with contacts
         self.add_contacts_to_data(data, contacts_data)
 
         # extend basic data with parameters
-        self.add_parameters_to_data(data, parameters_data, units_data)
+        self.add_parameters_to_data(data, parameters_data, unit_lookup)
 
         self.add_links_to_data(data, id_)
 
-        logger.debug("data: %s", data)
-        mapped_data = map_jamespath_to_attribute_uri(self.attribute_mapping, data)
-        self.set_item_link(mapped_data, data)
-        return mapped_data
+        if not any(isinstance(result, dict) and "errors" in result for result in results.values()):
+            self.set_cached_detail(id_, data)
+        return data
 
     @property
     def base_url_origin(self) -> str:
@@ -126,12 +185,65 @@ class O2ARegistrySearchHandler(GenericSearchHandler):
                 contacts.append(simplified)
         data["contacts"] = contacts
 
-    def add_parameters_to_data(self, data: dict, parameters_data: dict, units_data: dict) -> None:
+    def get_unit_lookup(self) -> dict:
+        """
+        Returns the `@uuid` to code lookup of the units of the registry, or an
+        `{"errors": [...]}` dictionary if it could not be fetched yet.
+
+        The lookup is shared by all handlers with the same `base_url`. Once it
+        is older than `units_cache_timeout`, it is revalidated and only
+        rebuilt if the units changed. If the registry cannot be reached, the
+        previous lookup is used and the registry is asked again after
+        `UNITS_RETRY_BACKOFF` seconds.
+
+        Only one request per registry is made at a time. While the lookup is
+        revalidated, other callers use the previous lookup if there is one,
+        and otherwise wait for the request.
+        """
+        units_url = self.units_url.format(base_url=self.base_url)
+        with _unit_lookups_lock:
+            lookup = _unit_lookups.get(units_url)
+            lock = _unit_lookup_locks.setdefault(units_url, threading.Lock())
+        if self._is_unit_lookup_fresh(lookup):
+            return lookup.get_codes()
+
+        if not lock.acquire(blocking=lookup is None):
+            return lookup.get_codes()
+        try:
+            # another caller may have revalidated the lookup in the meantime
+            lookup = _unit_lookups.get(units_url)
+            if self._is_unit_lookup_fresh(lookup):
+                return lookup.get_codes()
+
+            units_data, validators = fetch_json_if_modified(units_url, lookup.validators if lookup is not None else None)
+            if units_data is None:
+                lookup.checked_at = time.monotonic()
+                return lookup.get_codes()
+            if not isinstance(units_data, dict) or "errors" in units_data:
+                logger.warning("Cannot fetch the units of %s, using the previous units", self.base_url)
+                if lookup is None:
+                    lookup = _unit_lookups[units_url] = UnitLookup(codes={}, validators={}, checked_at=-math.inf, complete=False)
+                lookup.retry_at = time.monotonic() + UNITS_RETRY_BACKOFF
+                return lookup.get_codes()
+
+            codes = {unit["@uuid"]: unit.get("code") for unit in units_data.get("records", []) if "@uuid" in unit}
+            _unit_lookups[units_url] = UnitLookup(codes=codes, validators=validators, checked_at=time.monotonic())
+            logger.debug("Built unit lookup of %s with %s unit(s)", self.base_url, len(codes))
+            return codes
+        finally:
+            lock.release()
+
+    def _is_unit_lookup_fresh(self, lookup: UnitLookup | None) -> bool:
+        if lookup is None:
+            return False
+        now = time.monotonic()
+        return now - lookup.checked_at < self.units_cache_timeout or now < lookup.retry_at
+
+    def add_parameters_to_data(self, data: dict, parameters_data: dict, unit_lookup: dict[str, str]) -> None:
         # That's a bit special in the case of O2A. It is not guaranteed that
-        # the unit is provided. Therefore it must be looked up on another
-        # endpoint (`units_data`).
+        # the unit is provided. Therefore it must be looked up in the global
+        # units list (`unit_lookup`).
         parameters = []
-        unit_lookup = {u["@uuid"]: u.get("code") for u in units_data.get("records", []) if "@uuid" in u}
 
         for parameter in parameters_data.get("records", []):
             name = parameter.get("name", "")
@@ -9,6 +9,7 @@ from django.utils import timezone as django_timezone
 from rdmo_sensorsearch.client import fetch_json
 from rdmo_sensorsearch.handlers.base import CollectionAssignment, GenericSearchHandler, HandlerResult
 from rdmo_sensorsearch.handlers.parser import map_jamespath_to_attribute_uri, parse_datetime
+from rdmo_sensorsearch.pagination import DEFAULT_PAGE_SIZE, iter_o2a_pages, o2a_records
 from rdmo_sensorsearch.signals.device_set_sync import (
     SelectedDevice,
     sync_device_detail_blocks_from_payload,
@@ -20,15 +21,22 @@ logger = logging.getLogger(__name__)
 class O2ARegistryMissionsHandler(GenericSearchHandler):
     """
     Resolves one O2A Registry mission and materializes its associated items.
+
+    The items are resolved in parallel, `max_concurrent_fetches` sets the
+    fan-out width.
     """
 
     id_prefix = "o2amission"
     base_url = "https://registry.o2a-data.de/rest/v2"
 
     mission_url = "{base_url}/missions/{id}"
-    mission_items_url = "{base_url}/missions/{id}/items?offset=0&hits={page_size}"
+    mission_items_url = "{base_url}/missions/{id}/items?offset={offset}&hits={page_size}"
     item_url = "{base_url}/items/{id}"
-    mission_item_max_hits = 100
+    # all pages are fetched, the limit optionally caps the number of items
+    mission_item_page_size = DEFAULT_PAGE_SIZE
+    mission_item_limit: int | None = None
+    # `mission_item_max_hits` used to set the size of the only page
+    renamed_kwargs = {"mission_item_max_hits": "mission_item_page_size"}
 
     item_id_prefix = "o2aregistry"
     item_text_prefix = "O2A Item"
@@ -51,14 +59,8 @@ class O2ARegistryMissionsHandler(GenericSearchHandler):
             logger.warning("Unexpected O2A mission payload for ID %s: %s", id_, type(mission_data).__name__)
             return {"errors": [f"Unexpected O2A mission payload for ID {id_}"]}
 
-        mission_items_data = fetch_json(
-            self.mission_items_url.format(
-                base_url=self.base_url,
-                id=id_,
-                page_size=self.mission_item_max_hits,
-            )
-        )
-        if isinstance(mission_items_data, dict) and "errors" in mission_items_data:
+        mission_items_data = self._fetch_mission_items_data(id_)
+        if "errors" in mission_items_data:
             logger.debug(
                 "Errors in O2A mission items data returned for ID %s: %s",
                 id_,
@@ -66,7 +68,7 @@ class O2ARegistryMissionsHandler(GenericSearchHandler):
             )
             return mission_items_data
 
-        mapped_values = map_jamespath_to_attribute_uri(self.attribute_mapping, mission_data)
+        mapped_values = map_jamespath_to_attribute_uri(self.compiled_attribute_mapping, mission_data)
         self._set_mission_links(mapped_values, id_)
         self._normalize_datetimes(mapped_values)
 
@@ -121,6 +123,29 @@ class O2ARegistryMissionsHandler(GenericSearchHandler):
 
         return result
 
+    def _fetch_mission_items_data(self, mission_id: str) -> dict:
+        """
+        Fetches all pages of the items of the mission, at most
+        `mission_item_limit` if set.
+        """
+        records = []
+        pages = iter_o2a_pages(self.mission_items_url, self.mission_item_page_size, base_url=self.base_url, id=mission_id)
+        try:
+            for page in pages:
+                if isinstance(page, dict) and "errors" in page:
+                    if not records:
+                        return page
+                    logger.warning("Incomplete items of O2A mission %s: %s", mission_id, page["errors"])
+                    break
+
+                records.extend(o2a_records(page))
+                if self.mission_item_limit is not None and len(records) >= self.mission_item_limit:
+                    del records[self.mission_item_limit :]
+                    break
+        finally:
+            pages.close()
+        return {"records": records}
+
     def _set_mission_links(self, mapped_values: dict[str, str | None], mission_id: str) -> None:
         values = {
             "base_url": self.base_url,
@@ -159,13 +184,15 @@ class O2ARegistryMissionsHandler(GenericSearchHandler):
         mission_items_data: dict,
         mission_period: tuple[str | None, str | None],
     ) -> list[dict[str, str]]:
-        values = []
-        for mission_item in self._mission_items(mission_items_data):
-            item_id = mission_item.get("itemId")
-            if item_id is None:
-                continue
+        mission_items = [
+            mission_item for mission_item in self._mission_items(mission_items_data) if mission_item.get("itemId") is not None
+        ]
+        items = self._fetch_items([str(mission_item["itemId"]) for mission_item in mission_items])
 
-            item_data = self._fetch_item(str(item_id))
+        values = []
+        for mission_item in mission_items:
+            item_id = mission_item["itemId"]
+            item_data = items.get(str(item_id))
             if item_data is None:
                 logger.warning("O2A mission item %s could not be resolved", item_id)
                 continue
@@ -192,6 +219,18 @@ class O2ARegistryMissionsHandler(GenericSearchHandler):
             return records if isinstance(records, list) else []
         return mission_items_data if isinstance(mission_items_data, list) else []
 
+    def _fetch_items(self, item_ids: list[str]) -> dict[str, dict]:
+        """
+        Resolves the items of a mission in parallel, at most
+        `max_concurrent_fetches` at a time.
+        """
+        results = self.fetch_concurrently({item_id: partial(self._fetch_item, item_id) for item_id in dict.fromkeys(item_ids)})
+        return {
+            item_id: item_data
+            for item_id, item_data in results.items()
+            if isinstance(item_data, dict) and "errors" not in item_data
+        }
+
     def _fetch_item(self, item_id: str) -> dict | None:
         item_data = fetch_json(self.item_url.format(base_url=self.base_url, id=item_id))
         if isinstance(item_data, dict) and "errors" in item_data:
@@ -1,6 +1,7 @@
 import logging
 from datetime import datetime
 from datetime import timezone as dt_timezone
+from functools import partial
 from urllib.parse import urljoin, urlsplit
 
 from rdmo.projects.models import Value
@@ -8,6 +9,12 @@ from rdmo.projects.models import Value
 from rdmo_sensorsearch.client import fetch_json
 from rdmo_sensorsearch.handlers.base import GenericSearchHandler
 from rdmo_sensorsearch.handlers.parser import map_jamespath_to_attribute_uri
+from rdmo_sensorsearch.harvest.mount_index import (
+    MountPeriod,
+    get_device_mount_index,
+    indexed_device_mount_actions,
+)
+from rdmo_sensorsearch.pagination import DEFAULT_PAGE_SIZE, iter_jsonapi_pages, iter_records, jsonapi_records
 
 logger = logging.getLogger(__name__)
 
@@ -28,10 +35,23 @@ class SensorManagementSystemHandler(GenericSearchHandler):
     # id_prefix = "sms"
     sync_device_detail_blocks = True
     supports_mount_action_period_lookup = True
+    prefetchable = True
 
     # URL templates with placeholders
     device_url = "{base_url}/devices/{id}?include=device_properties"
     contact_url = "{base_url}/devices/{id}/device-contact-roles?include=contact"
+    # mount actions of the device in one configuration, only the configuration
+    # linkage is used
+    configuration_mount_actions_url = (
+        "{base_url}/devices/{id}/device-mount-actions?filter[configuration_id]={configuration_id}"
+        "&include=configuration&page[size]={page_size}&page[number]={page_number}"
+    )
+    # all mount actions of the device, for `get_mount_periods`
+    device_mount_actions_url = (
+        "{base_url}/devices/{id}/device-mount-actions?include=begin_contact,end_contact,parent_platform,parent_device,configuration"
+        "&page[size]={page_size}&page[number]={page_number}"
+    )
+    mount_actions_page_size = DEFAULT_PAGE_SIZE
     backend_link_marker = "/backend/api/v1/"
     device_link_attribute_uri = DEVICE_LINK_ATTRIBUTE_URI
 
@@ -47,24 +67,43 @@ class SensorManagementSystemHandler(GenericSearchHandler):
                   response.
         """
 
-        data = fetch_json(self.device_url.format(base_url=self.base_url, id=id_))
-
-        if "errors" in data:
-            logger.debug("Errors in data returned for ID %s, %s", id_, ", ".join(data["errors"]))
-            return data
-
-        # contacts can not be included in the first request with the include parameter
-        contact_data = fetch_json(self.contact_url.format(base_url=self.base_url, id=id_))
-
-        # add the included contact data to the data
-        data["included"] = [*data.get("included", []), *contact_data.get("included", [])]
+        configuration_id = self._resolve_configuration_id(instance)
+
+        # the device with its contacts is cached as one payload, the mount
+        # actions depend on the configuration and are memoized per sync
+        data = self.get_cached_detail(id_)
+
+        # the device, its contacts and its mount actions in the configuration
+        # do not depend on each other, so they are fetched in parallel.
+        # Contacts can not be included in the device request with the include
+        # parameter.
+        fetches = {}
+        if data is None:
+            fetches["device"] = partial(fetch_json, self.device_url.format(base_url=self.base_url, id=id_))
+            fetches["contacts"] = partial(fetch_json, self.contact_url.format(base_url=self.base_url, id=id_))
+        if configuration_id:
+            fetches["mount_actions"] = partial(self.get_device_mount_actions, id_, configuration_id)
+        results = self.fetch_concurrently(fetches)
+
+        if data is None:
+            data = results["device"]
+            if "errors" in data:
+                logger.debug("Errors in data returned for ID %s, %s", id_, ", ".join(data["errors"]))
+                return data
+
+            # add the included contact data to the data
+            data["included"] = [*data.get("included", []), *results["contacts"].get("included", [])]
+            if "errors" not in results["contacts"]:
+                self.set_cached_detail(id_, data)
 
         if not data:
             logger.debug("Empty data returned for ID %s", id_)
 
-        mapped_data = map_jamespath_to_attribute_uri(self.attribute_mapping, data)
+        mapped_data = map_jamespath_to_attribute_uri(self.compiled_attribute_mapping, data)
         self._set_frontend_device_link(mapped_data, data)
-        self._set_mount_period(mapped_data, id_, instance)
+        mount_actions = results.get("mount_actions")
+        if configuration_id and isinstance(mount_actions, list):
+            self._set_mount_period(mapped_data, id_, configuration_id, mount_actions)
         return mapped_data
 
     def _set_frontend_device_link(self, mapped_data: dict, device_data: dict) -> None:
@@ -87,19 +126,47 @@ class SensorManagementSystemHandler(GenericSearchHandler):
         parsed = urlsplit(self.base_url)
         return f"{parsed.scheme}://{parsed.netloc}"
 
-    def _set_mount_period(self, mapped_data: dict, device_id: str, instance=None) -> None:
+    def _resolve_configuration_id(self, instance) -> str | None:
         configuration_external_id = self._resolve_configuration_external_id(instance)
         if not configuration_external_id:
-            return
+            return None
+        return self._parse_external_id(configuration_external_id)[1]
 
-        configuration_id = self._parse_external_id(configuration_external_id)[1]
-        if not configuration_id:
-            return
+    def get_device_mount_actions(self, device_id: str, configuration_id: str) -> list[dict]:
+        """
+        Returns the mount actions of the device in the configuration.
 
-        mount_actions = self._fetch_device_mount_actions(device_id)
-        if not mount_actions:
-            return
+        They are answered from the harvested mount actions if available,
+        otherwise fetched from the SMS, filtered by the configuration on the
+        server. Within a `sync_memo()` block they are fetched at most once per
+        device and configuration.
+
+        Args:
+            device_id (str):        The ID of the device in the SMS.
+            configuration_id (str): The ID of the configuration in the SMS.
+
+        Returns:
+            list: The mount action records.
+        """
+        mount_actions = indexed_device_mount_actions(self.id_prefix, device_id, configuration_id)
+        if mount_actions:
+            return mount_actions
+        return self.memoized(
+            ("device-mount-actions", device_id, configuration_id),
+            partial(self._fetch_configuration_mount_actions, device_id, configuration_id),
+        )
 
+    def _fetch_configuration_mount_actions(self, device_id: str, configuration_id: str) -> list[dict]:
+        pages = iter_jsonapi_pages(
+            self.configuration_mount_actions_url,
+            self.mount_actions_page_size,
+            base_url=self.base_url,
+            id=device_id,
+            configuration_id=configuration_id,
+        )
+        return list(iter_records(pages, jsonapi_records))
+
+    def _set_mount_period(self, mapped_data: dict, device_id: str, configuration_id: str, mount_actions: list[dict]) -> None:
         matching_actions = []
         for item in mount_actions:
             relationships = item.get("relationships", {})
@@ -107,8 +174,9 @@ class SensorManagementSystemHandler(GenericSearchHandler):
             if config_ref.get("id") != configuration_id:
                 continue
 
-            action_device_ref = relationships.get("device", {}).get("data", {})
-            if action_device_ref.get("id") != device_id:
+            # the device linkage is only present if the device was included
+            action_device_ref = relationships.get("device", {}).get("data") or {}
+            if action_device_ref.get("id") not in (None, device_id):
                 continue
 
             attrs = item.get("attributes", {})
@@ -150,25 +218,34 @@ class SensorManagementSystemHandler(GenericSearchHandler):
         configuration_external_id, _ = root_value.external_id.split("||", 1)
         return configuration_external_id or None
 
+    def get_mount_periods(self, device_id: str) -> list[MountPeriod]:
+        """
+        Returns in which configurations, and when, the device was mounted.
+
+        The periods are answered from the harvested mount actions of this SMS
+        instance if available, otherwise they are fetched from the SMS.
+
+        Args:
+            device_id (str): The ID of the device in the SMS.
+
+        Returns:
+            list: The MountPeriod objects of the device, ordered by begin date.
+        """
+        index = get_device_mount_index(self.id_prefix)
+        if index is not None:
+            return index.periods(device_id)
+
+        periods = [MountPeriod.from_action(action) for action in self._fetch_device_mount_actions(device_id)]
+        return sorted((period for period in periods if period is not None), key=lambda period: period.begin_date or "")
+
     def _fetch_device_mount_actions(self, device_id: str) -> list[dict]:
-        url = getattr(
-            self,
-            "device_mount_actions_url",
-            "{base_url}/devices/{id}/device-mount-actions"
-            "?page[size]=10000&include=begin_contact,end_contact,parent_platform,parent_device,configuration",
-        ).format(base_url=self.base_url, id=device_id)
-        action_data = fetch_json(url)
-        if isinstance(action_data, dict) and "errors" in action_data:
-            logger.warning(
-                "Could not fetch device mount actions for %s: %s",
-                device_id,
-                action_data["errors"],
-            )
-            return []
-        if not isinstance(action_data, dict):
-            return []
-        data = action_data.get("data", [])
-        return data if isinstance(data, list) else []
+        pages = iter_jsonapi_pages(
+            self.device_mount_actions_url,
+            self.mount_actions_page_size,
+            base_url=self.base_url,
+            id=device_id,
+        )
+        return list(iter_records(pages, jsonapi_records))
 
     def _parse_external_id(self, external_id: str) -> tuple[str | None, str | None]:
         if ":" not in external_id:
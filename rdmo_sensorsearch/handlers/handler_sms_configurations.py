@@ -1,14 +1,17 @@
+import json
 import logging
 from datetime import datetime
 from datetime import timezone as dt_timezone
 from functools import partial
-from urllib.parse import urljoin
+from urllib.parse import quote, urljoin
 
 from django.utils import timezone as django_timezone
 
 from rdmo_sensorsearch.client import fetch_json
 from rdmo_sensorsearch.handlers.base import CollectionAssignment, GenericSearchHandler, HandlerResult
 from rdmo_sensorsearch.handlers.parser import map_jamespath_to_attribute_uri, parse_datetime
+from rdmo_sensorsearch.harvest.location_index import get_configuration_location_index
+from rdmo_sensorsearch.pagination import DEFAULT_PAGE_SIZE, iter_jsonapi_pages, iter_records, jsonapi_records
 from rdmo_sensorsearch.signals.device_set_sync import (
     SelectedDevice,
     sync_device_detail_blocks_from_payload,
@@ -27,12 +30,25 @@ class SensorManagementSystemConfigurationsHandler(GenericSearchHandler):
     device_url = "{base_url}/devices/{id}"
     device_mount_action_url = "{base_url}/device-mount-actions/{id}"
     device_mount_actions_url = (
-        "{base_url}/device-mount-actions?filter[configuration_id]={id}&include=device&page[size]={page_size}"
+        "{base_url}/device-mount-actions?filter[configuration_id]={id}&include=device"
+        "&page[size]={page_size}&page[number]={page_number}"
     )
+    filtered_collection_url = "{base_url}/{collection}?filter={filter}&page[size]={page_size}&hide_archived=false"
     mounting_action_timepoints_url = "{base_url}/configurations/{id}/mounting-action-timepoints"
-    static_location_actions_url = "{base_url}/static-location-actions?filter[configuration_id]={id}&page[size]={page_size}"
-    mounted_sensor_max_hits = 100
-    static_location_max_hits = 100
+    static_location_actions_url = (
+        "{base_url}/static-location-actions?filter[configuration_id]={id}&page[size]={page_size}&page[number]={page_number}"
+    )
+    # all pages are fetched, the limits optionally cap the number of records
+    mounted_sensor_page_size = DEFAULT_PAGE_SIZE
+    mounted_sensor_limit: int | None = None
+    static_location_page_size = DEFAULT_PAGE_SIZE
+    static_location_limit: int | None = None
+    # the `*_max_hits` keys used to set the size of the only page
+    renamed_kwargs = {
+        "mounted_sensor_max_hits": "mounted_sensor_page_size",
+        "static_location_max_hits": "static_location_page_size",
+    }
+    batch_size = 50
     configuration_self_link_path = "data.links.self"
     configuration_start_date_path = "data.attributes.start_date"
     configuration_end_date_path = "data.attributes.end_date"
@@ -50,18 +66,12 @@ class SensorManagementSystemConfigurationsHandler(GenericSearchHandler):
             logger.debug("Errors in configuration data returned for ID %s: %s", id_, configuration_data["errors"])
             return configuration_data
 
-        mount_action_data = fetch_json(
-            self.device_mount_actions_url.format(
-                base_url=self.base_url,
-                id=id_,
-                page_size=self.mounted_sensor_max_hits,
-            )
-        )
+        mount_action_data = self._fetch_mount_action_data(id_)
         if "errors" in mount_action_data:
             logger.debug("Errors in device mount action data returned for ID %s: %s", id_, mount_action_data["errors"])
             return mount_action_data
 
-        mapped_values = map_jamespath_to_attribute_uri(self.attribute_mapping, configuration_data)
+        mapped_values = map_jamespath_to_attribute_uri(self.compiled_attribute_mapping, configuration_data)
         self._set_configuration_links(mapped_values, configuration_data)
         self._normalize_configuration_datetimes(mapped_values)
         self._set_configuration_location(mapped_values, id_)
@@ -114,6 +124,35 @@ class SensorManagementSystemConfigurationsHandler(GenericSearchHandler):
 
         return result
 
+    def _fetch_mount_action_data(self, configuration_id: str) -> dict:
+        """
+        Fetches all pages of the device mount actions of the configuration
+        and joins them into one document with their included devices.
+        """
+        mount_action_data = {"data": [], "included": []}
+        pages = iter_jsonapi_pages(
+            self.device_mount_actions_url,
+            self.mounted_sensor_page_size,
+            base_url=self.base_url,
+            id=configuration_id,
+        )
+        try:
+            for page in pages:
+                if "errors" in page:
+                    if not mount_action_data["data"]:
+                        return page
+                    logger.warning("Incomplete mount actions of configuration %s: %s", configuration_id, page["errors"])
+                    break
+
+                mount_action_data["data"].extend(jsonapi_records(page))
+                mount_action_data["included"].extend(page.get("included", []))
+                if self.mounted_sensor_limit is not None and len(mount_action_data["data"]) >= self.mounted_sensor_limit:
+                    del mount_action_data["data"][self.mounted_sensor_limit :]
+                    break
+        finally:
+            pages.close()
+        return mount_action_data
+
     def _set_configuration_links(self, mapped_values: dict[str, str | None], configuration_data: dict) -> None:
         raw_self_link = self._get_configuration_self_link(configuration_data)
         if not raw_self_link:
@@ -187,22 +226,7 @@ class SensorManagementSystemConfigurationsHandler(GenericSearchHandler):
         if not any((location_attribute_uri, latitude_attribute_uri, longitude_attribute_uri)):
             return
 
-        location_actions_data = fetch_json(
-            self.static_location_actions_url.format(
-                base_url=self.base_url,
-                id=configuration_id,
-                page_size=self.static_location_max_hits,
-            )
-        )
-        if "errors" in location_actions_data:
-            logger.debug(
-                "Errors in static location action data returned for configuration ID %s: %s",
-                configuration_id,
-                location_actions_data["errors"],
-            )
-            return
-
-        action = self._select_best_static_location_action(location_actions_data.get("data", []))
+        action = self._select_best_static_location_action(self._get_static_location_actions(configuration_id))
         if action is None:
             return
 
@@ -221,6 +245,20 @@ class SensorManagementSystemConfigurationsHandler(GenericSearchHandler):
         if location_attribute_uri:
             mapped_values[location_attribute_uri] = f"({lat},{lon})"
 
+    def _get_static_location_actions(self, configuration_id: str) -> list[dict]:
+        index = get_configuration_location_index(getattr(self, "sensor_id_prefix", self.id_prefix))
+        actions = index.actions(configuration_id) if index is not None else []
+        if actions:
+            return actions
+
+        pages = iter_jsonapi_pages(
+            self.static_location_actions_url,
+            self.static_location_page_size,
+            base_url=self.base_url,
+            id=configuration_id,
+        )
+        return list(iter_records(pages, jsonapi_records, self.static_location_limit))
+
     def _select_best_static_location_action(self, actions: list[dict]) -> dict | None:
         if not actions:
             return None
@@ -245,27 +283,38 @@ class SensorManagementSystemConfigurationsHandler(GenericSearchHandler):
         mount_action_data: dict,
         cfg_period: tuple[datetime, datetime] | None = None,
     ) -> list[dict[str, str]]:
-        included_devices = {item["id"]: item for item in mount_action_data.get("included", []) if item.get("type") == "device"}
+        included_devices = {
+            str(item["id"]): item for item in mount_action_data.get("included", []) if item.get("type") == "device"
+        }
 
         sensor_id_prefix = getattr(self, "sensor_id_prefix", self.id_prefix)
         member_sensor_values = []
 
-        mount_actions = self._get_mount_actions(configuration_data, mount_action_data)
+        mount_actions = [
+            mount_action
+            for mount_action in self._get_mount_actions(configuration_data, mount_action_data)
+            if cfg_period is None or self._is_mount_action_in_period(mount_action, cfg_period)
+        ]
+
+        missing_device_ids = list(
+            dict.fromkeys(
+                device_id
+                for device_id in (self._get_mount_action_device_id(mount_action) for mount_action in mount_actions)
+                if device_id and device_id not in included_devices
+            )
+        )
+        if missing_device_ids:
+            included_devices.update(self._fetch_resources("devices", self.device_url, missing_device_ids))
 
         for mount_action in mount_actions:
-            if cfg_period is not None and not self._is_mount_action_in_period(mount_action, cfg_period):
-                continue
-
-            device_ref = mount_action.get("relationships", {}).get("device", {}).get("data")
-            if not device_ref:
+            device_id = self._get_mount_action_device_id(mount_action)
+            if not device_id:
                 continue
 
-            device = included_devices.get(device_ref["id"])
+            device = included_devices.get(device_id)
             if device is None:
-                device = self._fetch_device(device_ref["id"])
-                if device is None:
-                    logger.warning("Mounted device %s could not be resolved", device_ref["id"])
-                    continue
+                logger.warning("Mounted device %s could not be resolved", device_id)
+                continue
 
             attrs = mount_action.get("attributes", {})
             member_sensor_values.append(
@@ -312,29 +361,80 @@ class SensorManagementSystemConfigurationsHandler(GenericSearchHandler):
             configuration_data.get("data", {}).get("relationships", {}).get("device_mount_actions", {}).get("data", [])
         )
 
-        resolved_mount_actions = []
-        for action_ref in relationship_actions:
-            action_id = action_ref.get("id")
-            if not action_id:
-                continue
+        action_ids = [str(action_ref["id"]) for action_ref in relationship_actions if action_ref.get("id")]
+        if not action_ids:
+            return []
 
-            action_data = fetch_json(self.device_mount_action_url.format(base_url=self.base_url, id=action_id))
-            if "errors" in action_data:
-                logger.warning("Could not fetch mount action %s: %s", action_id, action_data["errors"])
-                continue
+        resolved_mount_actions = self._fetch_resources("device-mount-actions", self.device_mount_action_url, action_ids)
+        return [resolved_mount_actions[action_id] for action_id in action_ids if action_id in resolved_mount_actions]
 
-            action = action_data.get("data")
-            if action:
-                resolved_mount_actions.append(action)
+    def _get_mount_action_device_id(self, mount_action: dict) -> str | None:
+        device_ref = mount_action.get("relationships", {}).get("device", {}).get("data")
+        if not device_ref or device_ref.get("id") is None:
+            return None
+        return str(device_ref["id"])
+
+    def _fetch_resources(self, collection: str, resource_url: str, resource_ids: list[str]) -> dict[str, dict]:
+        """
+        Resolves resources of a collection by their ids.
+
+        The ids are requested in batches of `batch_size` with a JSON:API `in_`
+        filter on the id. Resources missing from the batch responses, e.g.
+        because a batch request failed, are fetched one by one. All requests
+        run in parallel within the concurrency limit of the backend.
+
+        Args:
+            collection (str):       The collection, e.g. "devices".
+            resource_url (str):     URL template of a single resource.
+            resource_ids (list):    The ids to resolve.
+
+        Returns:
+            dict: The resolved resources by their id.
+        """
+        batches = [resource_ids[start : start + self.batch_size] for start in range(0, len(resource_ids), self.batch_size)]
+        batch_results = self.fetch_concurrently(
+            {
+                f"{collection} batch {index}": partial(
+                    fetch_json,
+                    self.filtered_collection_url.format(
+                        base_url=self.base_url,
+                        collection=collection,
+                        filter=quote(json.dumps([{"name": "id", "op": "in_", "val": batch}], separators=(",", ":"))),
+                        page_size=len(batch),
+                    ),
+                )
+                for index, batch in enumerate(batches)
+            }
+        )
 
-        return resolved_mount_actions
+        resources = {}
+        for batch_data in batch_results.values():
+            if not isinstance(batch_data, dict) or "errors" in batch_data:
+                logger.debug("Batch request for %s failed, fetching them one by one", collection)
+                continue
+            for resource in batch_data.get("data", []):
+                if resource.get("id") is not None:
+                    resources[str(resource["id"])] = resource
+
+        missing_ids = [resource_id for resource_id in resource_ids if resource_id not in resources]
+        if missing_ids:
+            single_results = self.fetch_concurrently(
+                {resource_id: partial(self._fetch_resource, resource_url, resource_id) for resource_id in missing_ids}
+            )
+            resources.update(
+                (resource_id, resource)
+                for resource_id, resource in single_results.items()
+                if isinstance(resource, dict) and "errors" not in resource
+            )
+        return resources
 
-    def _fetch_device(self, device_id: str) -> dict | None:
-        device_data = fetch_json(self.device_url.format(base_url=self.base_url, id=device_id))
-        if "errors" in device_data:
-            logger.warning("Could not fetch device %s: %s", device_id, device_data["errors"])
+    def _fetch_resource(self, resource_url: str, resource_id: str) -> dict | None:
+        url = resource_url.format(base_url=self.base_url, id=resource_id)
+        resource_data = fetch_json(url)
+        if "errors" in resource_data:
+            logger.warning("Could not fetch %s: %s", url, resource_data["errors"])
             return None
-        return device_data.get("data")
+        return resource_data.get("data")
 
     def _get_cfg_period(self, instance) -> tuple[datetime, datetime] | None:
         if instance is None:
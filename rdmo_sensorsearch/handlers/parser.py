@@ -1,13 +1,149 @@
 import logging
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime
 
 import jmespath
+from jmespath import functions
 from jmespath.exceptions import JMESPathError
+from jmespath.parser import ParsedResult
 
 logger = logging.getLogger(__name__)
 
 
-def map_jamespath_to_attribute_uri(attribute_mapping: dict, data: dict) -> dict:
+class IncludedFunctions(functions.Functions):
+    """
+    JMESPath functions with indexed access to the JSON:API `included`
+    resources of one payload:
+
+    - ``lookup_included(type, id)`` returns the included resource or null,
+    - ``included_of_type(type)`` returns the included resources of a type,
+      or null if the payload has no `included` array.
+
+    Unlike filters like ``included[?type=='contact']``, which scan `included`
+    once per expression, the resources are indexed once per payload.
+    """
+
+    def __init__(self, data):
+        self._data = data
+        self._resources: dict[tuple[str, str], dict] | None = None
+        self._resources_by_type: dict[str, list[dict]] = {}
+
+    def _index(self) -> dict[tuple[str, str], dict] | None:
+        if self._resources is None:
+            included = self._data.get("included") if isinstance(self._data, dict) else None
+            if not isinstance(included, list):
+                return None
+            self._resources = {}
+            for resource in included:
+                if not isinstance(resource, dict):
+                    continue
+                resource_type = resource.get("type")
+                self._resources_by_type.setdefault(resource_type, []).append(resource)
+                self._resources.setdefault((resource_type, str(resource.get("id"))), resource)
+        return self._resources
+
+    @functions.signature({"types": ["string"]}, {"types": ["string", "number"]})
+    def _func_lookup_included(self, resource_type, resource_id):
+        resources = self._index()
+        return resources.get((resource_type, str(resource_id))) if resources is not None else None
+
+    @functions.signature({"types": ["string"]})
+    def _func_included_of_type(self, resource_type):
+        if self._index() is None:
+            return None
+        return list(self._resources_by_type.get(resource_type, []))
+
+
+@dataclass(frozen=True)
+class CompiledAttributeMapping:
+    """
+    The JMESPath expressions of an attribute mapping, parsed once.
+
+    With `combined`, all expressions are also joined into one multi-select
+    hash, so the values of all attributes are extracted in one evaluation.
+    If the combined expression fails, the expressions are evaluated one by
+    one and only the failing ones are skipped.
+
+    The expressions can use the functions of `IncludedFunctions`.
+    """
+
+    expressions: tuple[tuple[str, ParsedResult, str], ...]
+    combined: ParsedResult | None = None
+    errors: dict[str, str] = field(default_factory=dict)
+
+    def search(self, data) -> dict:
+        options = jmespath.Options(custom_functions=IncludedFunctions(data))
+        if self.combined is not None and isinstance(data, dict):
+            try:
+                values = self.combined.search(data, options=options)
+            except JMESPathError:
+                pass
+            else:
+                return {attribute_uri: values.get(f"_{index}") for index, (_, _, attribute_uri) in enumerate(self.expressions)}
+
+        mapped_values = {}
+        for path, expression, attribute_uri in self.expressions:
+            try:
+                value = expression.search(data, options=options)
+            except JMESPathError:
+                logger.exception(
+                    "Skipping attribute mapping for %s because JMESPath evaluation failed: %s",
+                    attribute_uri,
+                    path,
+                )
+                continue
+
+            mapped_values.update({f"{attribute_uri}": value})
+        return mapped_values
+
+
+_compiled_mappings: dict[tuple, CompiledAttributeMapping] = {}
+_compiled_mappings_lock = threading.Lock()
+
+
+def compile_attribute_mapping(attribute_mapping: dict, combined: bool = False) -> CompiledAttributeMapping:
+    """
+    Parses the JMESPath expressions of an attribute mapping. Invalid
+    expressions are left out and reported in `errors`. Mappings are compiled
+    only once per process.
+
+    Args:
+        attribute_mapping (dict): The mapping of JamesPath expressions to attribute URIs.
+        combined (bool):          Whether to also build a combined multi-select expression.
+
+    Returns:
+        CompiledAttributeMapping: The parsed expressions.
+    """
+    cache_key = (tuple(attribute_mapping.items()), combined)
+    with _compiled_mappings_lock:
+        compiled = _compiled_mappings.get(cache_key)
+    if compiled is not None:
+        return compiled
+
+    expressions = []
+    errors = {}
+    for path, attribute_uri in attribute_mapping.items():
+        try:
+            expressions.append((path, jmespath.compile(path), f"{attribute_uri}"))
+        except JMESPathError as e:
+            errors[path] = str(e)
+            logger.error("Invalid JMESPath expression for %s: %s (%s)", attribute_uri, path, e)
+
+    combined_expression = None
+    if combined and len(expressions) > 1:
+        selections = ", ".join(f"_{index}: ({path})" for index, (path, _, _) in enumerate(expressions))
+        try:
+            combined_expression = jmespath.compile(f"{{{selections}}}")
+        except JMESPathError as e:
+            logger.debug("Cannot combine attribute mapping into one expression: %s", e)
+
+    compiled = CompiledAttributeMapping(tuple(expressions), combined_expression, errors)
+    with _compiled_mappings_lock:
+        return _compiled_mappings.setdefault(cache_key, compiled)
+
+
+def map_jamespath_to_attribute_uri(attribute_mapping: dict | CompiledAttributeMapping, data: dict) -> dict:
     """
     Maps values from the response data to attribute URIs using JamesPath
     expressions.
@@ -15,7 +151,8 @@ def map_jamespath_to_attribute_uri(attribute_mapping: dict, data: dict) -> dict:
     The mapping is usually provided by the configuration file.
 
     Args:
-        attribute_mapping (dict): The mapping of attribute names to JamesPath URIs.
+        attribute_mapping (dict): The mapping of attribute names to JamesPath URIs,
+                                  or its compiled form.
         data (dict): The JSON response data.
 
     Returns:
@@ -23,19 +160,9 @@ def map_jamespath_to_attribute_uri(attribute_mapping: dict, data: dict) -> dict:
               keys.
 
     """
-    mapped_values = {}
-    for path, attribute_uri in attribute_mapping.items():
-        try:
-            value = jmespath.search(path, data)
-        except JMESPathError:
-            logger.exception(
-                "Skipping attribute mapping for %s because JMESPath evaluation failed: %s",
-                attribute_uri,
-                path,
-            )
-            continue
-
-        mapped_values.update({f"{attribute_uri}": value})
+    if not isinstance(attribute_mapping, CompiledAttributeMapping):
+        attribute_mapping = compile_attribute_mapping(attribute_mapping)
+    mapped_values = attribute_mapping.search(data)
     logger.debug("mapped_values %s", mapped_values)
     return mapped_values
 
@@ -0,0 +1,183 @@
+import logging
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from typing import Any
+
+from rdmo_sensorsearch.client import fetch_json
+from rdmo_sensorsearch.harvest.store import HarvestState, HarvestStore
+
+logger = logging.getLogger(__name__)
+
+
+class HarvestError(Exception):
+    """
+    Raised when a backend request fails during harvesting. The stored state of
+    the collection is left untouched.
+    """
+
+
+@dataclass
+class HarvestResult:
+    id_prefix: str
+    collection: str
+    incremental: bool
+    changed: int = 0
+    deleted: int = 0
+    total: int = 0
+    watermark: str | None = None
+    changed_ids: list[str] = field(default_factory=list)
+
+
+class BaseHarvester:
+    """
+    A common base class for harvesting registry catalogues into a local store.
+
+    A harvester knows one or more collections (e.g. ``devices``) of one
+    backend. Every collection is harvested incrementally: only records changed
+    since the stored watermark are fetched, deletions are detected by
+    comparing the list of remote ids with the local records. Backends which
+    cannot filter by modification date fall back to a full harvest.
+
+    Subclasses must define the following class attributes:
+    - id_prefix
+    - base_url
+    - collections
+    """
+
+    collections: tuple[str, ...] = ()
+    supports_incremental = True
+    supports_id_listing = True
+
+    def __init__(
+        self,
+        id_prefix: str | None = None,
+        base_url: str | None = None,
+        collections: list[str] | None = None,
+        **kwargs,
+    ):
+        self._id_prefix = id_prefix
+        self._base_url = base_url
+        if collections is not None:
+            self.collections = tuple(collections)
+        for key, value in kwargs.items():
+            setattr(self, key, value)
+
+    @property
+    def id_prefix(self) -> str:
+        value = self._id_prefix or getattr(type(self), "id_prefix", None)
+        if value is None:
+            raise NotImplementedError(f"{type(self).__name__} must define `id_prefix`")
+        return value
+
+    @property
+    def base_url(self) -> str:
+        value = self._base_url or getattr(type(self), "base_url", None)
+        if value is None:
+            raise NotImplementedError(f"{type(self).__name__} must define `base_url`")
+        return value
+
+    def harvest(self, store: HarvestStore, full: bool = False) -> list[HarvestResult]:
+        return [self.harvest_collection(store, collection, full=full) for collection in self.collections]
+
+    def harvest_collection(self, store: HarvestStore, collection: str, full: bool = False) -> HarvestResult:
+        state = store.load(self.id_prefix, collection)
+        incremental = self.supports_incremental and not full and state.watermark is not None and bool(state.records)
+        since = state.watermark if incremental else None
+        started_at = datetime.now(dt_timezone.utc).isoformat()
+
+        fetched_ids: set[str] = set()
+        records = dict(state.records) if incremental else {}
+        watermark = state.watermark if incremental else None
+        result = HarvestResult(id_prefix=self.id_prefix, collection=collection, incremental=incremental)
+
+        for record in self.fetch_changed(collection, since):
+            record_id = self.record_id(collection, record)
+            if record_id is None:
+                continue
+            record_id = str(record_id)
+            fetched_ids.add(record_id)
+            records[record_id] = record
+            result.changed += 1
+            if incremental:
+                result.changed_ids.append(record_id)
+
+            updated = self.record_updated(collection, record)
+            if updated and (watermark is None or updated > watermark):
+                watermark = updated
+
+        if incremental and self.supports_id_listing:
+            remote_ids = self.fetch_ids(collection)
+            if remote_ids is not None:
+                deleted_ids = set(records) - remote_ids
+                for record_id in deleted_ids:
+                    del records[record_id]
+                result.deleted = len(deleted_ids)
+        elif not incremental:
+            result.deleted = len(set(state.records) - fetched_ids)
+
+        state = HarvestState(
+            id_prefix=self.id_prefix,
+            collection=collection,
+            watermark=watermark,
+            harvested_at=started_at,
+            records=records,
+        )
+        store.save(state)
+
+        result.total = len(records)
+        result.watermark = watermark
+        logger.info(
+            "Harvested %s/%s (%s): %s changed, %s deleted, %s total, watermark=%s",
+            self.id_prefix,
+            collection,
+            "incremental" if incremental else "full",
+            result.changed,
+            result.deleted,
+            result.total,
+            watermark,
+        )
+        return result
+
+    def fetch_changed(self, collection: str, since: str | None) -> Iterator[dict[str, Any]]:
+        """
+        Yields all records of the collection changed since the watermark, or
+        all records if ``since`` is None.
+
+        Raises:
+            HarvestError: If a request to the backend fails.
+        """
+        raise NotImplementedError(f"{type(self).__name__} must implement `fetch_changed`")
+
+    def fetch_ids(self, collection: str) -> set[str] | None:
+        """
+        Returns the ids of all records currently available remotely, or None
+        if they could not be fetched. In that case no deletions are applied.
+        """
+        return None
+
+    def fetch_page(self, url: str) -> dict | list:
+        data = fetch_json(url)
+        if isinstance(data, dict) and "errors" in data:
+            raise HarvestError(f"Request to {url} failed: {data['errors']}")
+        return data
+
+    def record_id(self, collection: str, record: dict[str, Any]) -> Any:
+        return record.get("id")
+
+    def record_updated(self, collection: str, record: dict[str, Any]) -> str | None:
+        return None
+
+    def record_fields(self, collection: str, record: dict[str, Any]) -> dict[str, Any] | None:
+        """
+        Returns the searchable fields of a record for columnar snapshots, or
+        None if the records of the collection are not searched.
+
+        The fields are ``option_id`` (the id used in option ids),
+        ``name``, ``serial_number``, ``manufacturer`` and ``model``.
+        """
+        return None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}:id={self.id_prefix}, base_url={self.base_url}, collections={self.collections}"
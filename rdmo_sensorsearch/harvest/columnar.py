@@ -0,0 +1,165 @@
+import json
+import logging
+from pathlib import Path
+
+from rdmo_sensorsearch.harvest.store import HarvestState, HarvestStore
+from rdmo_sensorsearch.providers.base import normalize_identifier
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_METADATA_KEY = b"rdmo_sensorsearch"
+SNAPSHOT_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+class SnapshotError(Exception):
+    """
+    Raised when a columnar snapshot cannot be written or read.
+    """
+
+
+def require_pyarrow() -> None:
+    if pa is None:
+        raise SnapshotError("Columnar snapshots require pyarrow, install rdmo-plugins-sensorsearch[snapshots].")
+
+
+def snapshot_path(directory: str | Path, id_prefix: str, collection: str, snapshot_format: str = "parquet") -> Path:
+    return Path(directory) / f"{id_prefix}.{collection}{SNAPSHOT_FORMATS[snapshot_format]}"
+
+
+def build_snapshot_table(harvester, state: HarvestState):
+    """
+    Converts the harvested records of one collection into an Arrow table.
+
+    Besides the record itself (as JSON), the table holds the searchable fields
+    of the harvester's `record_fields` and precomputed, casefolded key columns
+    for the vectorized search of the `HarvestSnapshotProvider`.
+    """
+    require_pyarrow()
+
+    columns = {
+        key: []
+        for key in (
+            "record_id",
+            "option_id",
+            "name",
+            "serial_number",
+            "manufacturer",
+            "model",
+            "name_key",
+            "serial_key",
+            "haystack",
+            "record",
+        )
+    }
+    for record_id, record in state.records.items():
+        fields = harvester.record_fields(state.collection, record) or {}
+        values = {key: _to_text(fields.get(key)) for key in ("option_id", "name", "serial_number", "manufacturer", "model")}
+
+        columns["record_id"].append(record_id)
+        for key, value in values.items():
+            columns[key].append(value)
+        columns["name_key"].append((values["name"] or "").casefold())
+        columns["serial_key"].append(normalize_identifier(values["serial_number"]))
+        columns["haystack"].append(" ".join(value for value in values.values() if value).casefold())
+        columns["record"].append(json.dumps(record, separators=(",", ":")))
+
+    metadata = {
+        "id_prefix": state.id_prefix,
+        "collection": state.collection,
+        "watermark": state.watermark,
+        "harvested_at": state.harvested_at,
+    }
+    table = pa.table({key: pa.array(values, type=pa.string()) for key, values in columns.items()})
+    return table.replace_schema_metadata({SNAPSHOT_METADATA_KEY: json.dumps(metadata).encode("utf-8")})
+
+
+def write_snapshot(table, path: str | Path) -> None:
+    require_pyarrow()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == SNAPSHOT_FORMATS["arrow"]:
+        feather.write_feather(table, path, compression="zstd")
+    else:
+        pq.write_table(table, path, compression="zstd")
+    logger.debug("Wrote %s snapshot row(s) to %s", table.num_rows, path)
+
+
+def read_snapshot(path: str | Path, columns: list[str] | None = None):
+    require_pyarrow()
+    path = Path(path)
+    try:
+        if path.suffix == SNAPSHOT_FORMATS["arrow"]:
+            table = feather.read_table(path, columns=columns, memory_map=True)
+        else:
+            table = pq.read_table(path, columns=columns, memory_map=True)
+    except (OSError, pa.ArrowException) as e:
+        raise SnapshotError(f"Cannot read snapshot {path}: {e}") from e
+    return table
+
+
+def read_snapshot_metadata(table) -> dict:
+    metadata = (table.schema.metadata or {}).get(SNAPSHOT_METADATA_KEY)
+    if metadata is None:
+        raise SnapshotError("The file is not a sensor search snapshot")
+    return json.loads(metadata)
+
+
+def export_snapshots(
+    harvesters: list,
+    store: HarvestStore,
+    directory: str | Path,
+    snapshot_format: str = "parquet",
+) -> list[Path]:
+    """
+    Writes one snapshot file per harvester and collection of the store into
+    the directory. Collections which were never harvested are skipped.
+    """
+    paths = []
+    for harvester in harvesters:
+        for collection in harvester.collections:
+            if not store.path_for(harvester.id_prefix, collection).exists():
+                logger.info("Skipping %s/%s, it was not harvested yet", harvester.id_prefix, collection)
+                continue
+            state = store.load(harvester.id_prefix, collection)
+            path = snapshot_path(directory, harvester.id_prefix, collection, snapshot_format)
+            write_snapshot(build_snapshot_table(harvester, state), path)
+            paths.append(path)
+    return paths
+
+
+def import_snapshot(path: str | Path, store: HarvestStore) -> HarvestState:
+    """
+    Restores the harvest state of a snapshot file into the store, e.g. to
+    continue harvesting incrementally from a shipped snapshot.
+    """
+    table = read_snapshot(path)
+    metadata = read_snapshot_metadata(table)
+    state = HarvestState(
+        id_prefix=metadata["id_prefix"],
+        collection=metadata["collection"],
+        watermark=metadata.get("watermark"),
+        harvested_at=metadata.get("harvested_at"),
+        records={
+            record_id: json.loads(record)
+            for record_id, record in zip(
+                table.column("record_id").to_pylist(),
+                table.column("record").to_pylist(),
+                strict=True,
+            )
+        },
+    )
+    store.save(state)
+    return state
+
+
+def _to_text(value) -> str | None:
+    if value is None or value == "":
+        return None
+    return str(value)
@@ -0,0 +1,40 @@
+import logging
+
+from rdmo_sensorsearch.config import load_config, merge_config
+from rdmo_sensorsearch.harvest.registry import HARVESTER_REGISTRY
+
+logger = logging.getLogger(__name__)
+
+HARVEST_CONFIG_KEY = "harvest"
+
+
+def build_harvester_instances() -> list:
+    """
+    Factory method to create harvester instances from config.
+
+    Returns:
+        list: List of instantiated harvester objects.
+    """
+    configuration = load_config()
+    section_config = configuration.get(HARVEST_CONFIG_KEY, {})
+    harvester_definitions = section_config.get("harvesters", {})
+    harvester_defaults = section_config.get("harvester_defaults", {})
+
+    flattened_harvester_definitions = [
+        (harvester_name, merge_config(harvester_defaults.get(harvester_name, {}), config))
+        for harvester_name, configs in harvester_definitions.items()
+        for config in configs
+    ]
+
+    instances = []
+    for harvester_name, harvester_config in flattened_harvester_definitions:
+        try:
+            harvester_cls = HARVESTER_REGISTRY[harvester_name]
+            instances.append(harvester_cls(**harvester_config))
+        except KeyError:
+            logger.error("Harvester class %s not found in registry", harvester_name)
+        except TypeError as e:
+            logger.error("Error initializing %s with config %s: %s", harvester_name, harvester_config, e)
+
+    logger.debug("Built %s harvester instance(s): %s", len(instances), [repr(instance) for instance in instances])
+    return instances
@@ -0,0 +1,48 @@
+import logging
+from collections.abc import Iterator
+from typing import Any
+
+from rdmo_sensorsearch.harvest.base import BaseHarvester
+
+logger = logging.getLogger(__name__)
+
+
+class GeophysicalInstrumentPoolPotsdamHarvester(BaseHarvester):
+    """
+    Harvests the instrument list of the Geophysical Instrument Pool Potsdam
+    (GIPP).
+
+    The GIPP API has no modification date filter, but returns the complete
+    instrument list with a single request. Every run is therefore a full
+    harvest, deletions follow from the difference to the previous run.
+    """
+
+    id_prefix = "gfzgipp"
+    base_url = "https://gipp.gfz-potsdam.de/instruments"
+    collections = ("instruments",)
+    supports_incremental = False
+    supports_id_listing = False
+
+    instruments_url = "{base_url}/index.json?limit=10000&program=MOSES"
+
+    def fetch_changed(self, collection: str, since: str | None) -> Iterator[dict[str, Any]]:
+        instruments = self.fetch_page(self.instruments_url.format(base_url=self.base_url))
+        if not isinstance(instruments, list):
+            return
+        for instrument in instruments:
+            if isinstance(instrument, dict) and isinstance(instrument.get("Instrument"), dict):
+                yield instrument
+
+    def record_id(self, collection: str, record: dict[str, Any]) -> Any:
+        return record["Instrument"].get("id")
+
+    def record_fields(self, collection: str, record: dict[str, Any]) -> dict[str, Any] | None:
+        instrument = record["Instrument"]
+        category = record.get("Instrumentcategory")
+        return {
+            "option_id": instrument.get("id"),
+            "name": instrument.get("code"),
+            "serial_number": instrument.get("serialNo"),
+            "manufacturer": category.get("manufacturer") if isinstance(category, dict) else None,
+            "model": None,
+        }
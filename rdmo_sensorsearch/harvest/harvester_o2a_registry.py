@@ -0,0 +1,74 @@
+import logging
+from collections.abc import Iterator
+from typing import Any
+from urllib.parse import quote
+
+from rdmo_sensorsearch.harvest.base import BaseHarvester
+
+logger = logging.getLogger(__name__)
+
+
+class O2ARegistryHarvester(BaseHarvester):
+    """
+    Harvests items and missions of the O2A Registry.
+
+    The O2A REST API accepts RSQL ``where`` filters and ``sorts``, so records
+    are fetched incrementally by their modification date. Deletions are
+    detected by listing the ids of a collection.
+
+     base_url (str, optional):           The base URL for API requests
+                                                to the O2A Registry. Defaults
+                                                to 'https://registry.o2a-data.de/rest/v2'.
+    """
+
+    id_prefix = "o2aregistry"
+    base_url = "https://registry.o2a-data.de/rest/v2"
+    collections = ("items",)
+
+    updated_field = "lastModified"
+    page_size = 1000
+
+    changed_url = "{base_url}/{collection}?where={where}&sorts={sorts}&offset={offset}&hits={hits}"
+    ids_url = "{base_url}/{collection}?fields=id&offset={offset}&hits={hits}"
+
+    def fetch_changed(self, collection: str, since: str | None) -> Iterator[dict[str, Any]]:
+        where = "" if since is None else f'{self.updated_field}=ge="{since}"'
+        yield from self._fetch_pages(
+            self.changed_url,
+            collection=collection,
+            where=quote(where, safe='=*"'),
+            sorts=quote(f"ASC({self.updated_field})"),
+        )
+
+    def fetch_ids(self, collection: str) -> set[str] | None:
+        return {
+            str(record["id"]) for record in self._fetch_pages(self.ids_url, collection=collection) if record.get("id") is not None
+        }
+
+    def record_updated(self, collection: str, record: dict[str, Any]) -> str | None:
+        value = record.get(self.updated_field)
+        return str(value) if value is not None else None
+
+    def record_fields(self, collection: str, record: dict[str, Any]) -> dict[str, Any] | None:
+        if collection != "items":
+            return None
+        return {
+            "option_id": record.get("uniqueId") or record.get("id"),
+            "name": record.get("longName") or record.get("shortName") or record.get("code"),
+            "serial_number": record.get("serialNumber"),
+            "manufacturer": record.get("manufacturer"),
+            "model": record.get("model"),
+        }
+
+    def _fetch_pages(self, url_template: str, **url_kwargs) -> Iterator[dict[str, Any]]:
+        offset = 0
+        while True:
+            url = url_template.format(base_url=self.base_url, offset=offset, hits=self.page_size, **url_kwargs)
+            page = self.fetch_page(url)
+            records = page.get("records", []) if isinstance(page, dict) else []
+            yield from records
+
+            offset += len(records)
+            total = page.get("totalRecords") if isinstance(page, dict) else None
+            if len(records) < self.page_size or (isinstance(total, int) and offset >= total):
+                return
@@ -0,0 +1,106 @@
+import json
+import logging
+from collections.abc import Iterator
+from typing import Any
+from urllib.parse import quote
+
+from rdmo_sensorsearch.harvest.base import BaseHarvester
+
+logger = logging.getLogger(__name__)
+
+
+class SensorManagementSystemHarvester(BaseHarvester):
+    """
+    Harvests collections of a Sensor Management System (SMS) instance.
+
+    The SMS JSON:API supports filtering and sorting by ``updated_at``, so only
+    changed records are fetched after the first run. Deletions are detected by
+    listing the ids of a collection with a minimal sparse fieldset.
+
+    Attributes:
+        id_prefix (str):    The id_prefix of the SMS instance, the same as
+                            configured for the provider and handler.
+        base_url (str):     Base URL of the SMS API, e.g.
+                            "https://sensors.gfz-potsdam.de/backend/api/v1".
+        page_size (int):    Number of records requested per page.
+    """
+
+    collections = ("devices",)
+
+    # JSON:API resource type for the `fields[...]` parameter of every collection
+    resource_types = {
+        "devices": "device",
+        "configurations": "configuration",
+        "device-mount-actions": "device_mount_action",
+        "static-location-actions": "configuration_static_location_action",
+    }
+
+    updated_field = "updated_at"
+    page_size = 1000
+
+    changed_url = (
+        "{base_url}/{collection}?page[size]={page_size}&page[number]={page_number}"
+        "&sort={updated_field}&filter={filter}&hide_archived=false"
+    )
+    ids_url = (
+        "{base_url}/{collection}?page[size]={page_size}&page[number]={page_number}"
+        "&fields[{resource_type}]={updated_field}&hide_archived=false"
+    )
+
+    def record_fields(self, collection: str, record: dict[str, Any]) -> dict[str, Any] | None:
+        if collection != "devices":
+            return None
+        attributes = record.get("attributes") or {}
+        return {
+            "option_id": record.get("id"),
+            "name": attributes.get("long_name") or attributes.get("short_name"),
+            "serial_number": attributes.get("serial_number"),
+            "manufacturer": attributes.get("manufacturer_name"),
+            "model": attributes.get("model"),
+        }
+
+    def fetch_changed(self, collection: str, since: str | None) -> Iterator[dict[str, Any]]:
+        filters = [] if since is None else [{"name": self.updated_field, "op": "ge", "val": since}]
+        yield from self._fetch_pages(
+            self.changed_url,
+            collection=collection,
+            updated_field=self.updated_field,
+            filter=quote(json.dumps(filters, separators=(",", ":"))),
+        )
+
+    def fetch_ids(self, collection: str) -> set[str] | None:
+        resource_type = self.resource_types.get(collection)
+        if resource_type is None:
+            logger.debug("No resource type known for %s, skipping deletion detection", collection)
+            return None
+
+        return {
+            str(record["id"])
+            for record in self._fetch_pages(
+                self.ids_url,
+                collection=collection,
+                resource_type=resource_type,
+                updated_field=self.updated_field,
+            )
+            if record.get("id") is not None
+        }
+
+    def record_updated(self, collection: str, record: dict[str, Any]) -> str | None:
+        return record.get("attributes", {}).get(self.updated_field)
+
+    def _fetch_pages(self, url_template: str, **url_kwargs) -> Iterator[dict[str, Any]]:
+        page_number = 1
+        while True:
+            url = url_template.format(
+                base_url=self.base_url,
+                page_size=self.page_size,
+                page_number=page_number,
+                **url_kwargs,
+            )
+            page = self.fetch_page(url)
+            data = page.get("data", []) if isinstance(page, dict) else []
+            yield from data
+
+            if len(data) < self.page_size or not page.get("links", {}).get("next"):
+                return
+            page_number += 1
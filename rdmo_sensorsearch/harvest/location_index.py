@@ -0,0 +1,149 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from rdmo_sensorsearch.harvest.store import HarvestStore
+from rdmo_sensorsearch.spatial import GridIndex, SpatialQuery
+
+logger = logging.getLogger(__name__)
+
+STATIC_LOCATIONS_COLLECTION = "static-location-actions"
+CONFIGURATIONS_COLLECTION = "configurations"
+
+# static locations in other reference systems are not indexed
+WGS84_EPSG_CODES = {None, "", "4326", "EPSG:4326"}
+
+
+@dataclass(frozen=True)
+class ConfigurationLocation:
+    """
+    One static location of a configuration.
+    """
+
+    action_id: str
+    configuration_id: str
+    latitude: float
+    longitude: float
+    begin_date: str | None
+    end_date: str | None
+
+    @classmethod
+    def from_action(cls, action: dict[str, Any]) -> "ConfigurationLocation | None":
+        relationships = action.get("relationships") or {}
+        configuration_id = ((relationships.get("configuration") or {}).get("data") or {}).get("id")
+        attributes = action.get("attributes") or {}
+        if action.get("id") is None or configuration_id is None:
+            return None
+        if str(attributes.get("epsg_code") or "") not in WGS84_EPSG_CODES:
+            return None
+
+        try:
+            latitude, longitude = float(attributes["y"]), float(attributes["x"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not (-90.0 <= latitude <= 90.0 and -180.0 <= longitude <= 180.0):
+            return None
+
+        return cls(
+            action_id=str(action["id"]),
+            configuration_id=str(configuration_id),
+            latitude=latitude,
+            longitude=longitude,
+            begin_date=attributes.get("begin_date"),
+            end_date=attributes.get("end_date"),
+        )
+
+
+class ConfigurationLocationIndex:
+    """
+    Spatial index over the static locations of the configurations of one SMS
+    instance, built from its harvested `static-location-actions` and, if
+    harvested as well, its `configurations` for the option labels.
+
+    Bounding box and nearest neighbour searches consider every location a
+    configuration ever had and return each configuration once.
+    """
+
+    def __init__(self, actions: list[dict[str, Any]], configurations: dict[str, dict[str, Any]] | None = None):
+        self._configurations = configurations or {}
+        self._actions_by_configuration: dict[str, list[dict[str, Any]]] = {}
+        locations = []
+        for action in actions:
+            location = ConfigurationLocation.from_action(action)
+            if location is None:
+                continue
+            self._actions_by_configuration.setdefault(location.configuration_id, []).append(action)
+            locations.append(location)
+
+        self._grid = GridIndex((location.latitude, location.longitude, location) for location in locations)
+
+    def __len__(self) -> int:
+        return len(self._actions_by_configuration)
+
+    def actions(self, configuration_id: str) -> list[dict[str, Any]]:
+        return list(self._actions_by_configuration.get(str(configuration_id), []))
+
+    def configuration(self, configuration_id: str) -> dict[str, Any] | None:
+        """
+        Returns the harvested configuration record, if configurations were
+        harvested.
+        """
+        return self._configurations.get(str(configuration_id))
+
+    def search(self, query: SpatialQuery, count: int) -> list[tuple[ConfigurationLocation, float | None]]:
+        """
+        Returns up to `count` configurations matching the spatial query with
+        their distance in km, which is None for bounding box searches.
+        """
+        if query.kind == "bbox":
+            located = ((location, None) for _, _, location in self._grid.within(query.south, query.west, query.north, query.east))
+        else:
+            nearest = self._grid.nearest(query.latitude, query.longitude, query.radius_km)
+            located = ((location, distance) for distance, location in nearest)
+
+        results = []
+        seen: set[str] = set()
+        for location, distance in located:
+            if location.configuration_id in seen:
+                continue
+            seen.add(location.configuration_id)
+            results.append((location, distance))
+            if len(results) >= count:
+                break
+        return results
+
+
+_indexes: dict[tuple[str, str], tuple[tuple[int, int | None], ConfigurationLocationIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_configuration_location_index(id_prefix: str, store: HarvestStore | None = None) -> ConfigurationLocationIndex | None:
+    """
+    Returns the location index of the SMS instance with the id_prefix, or None
+    if its static location actions were never harvested. The index is rebuilt
+    when one of the harvested collections changes.
+    """
+    store = store or HarvestStore()
+    try:
+        locations_mtime_ns = store.path_for(id_prefix, STATIC_LOCATIONS_COLLECTION).stat().st_mtime_ns
+    except OSError:
+        return None
+    try:
+        configurations_mtime_ns = store.path_for(id_prefix, CONFIGURATIONS_COLLECTION).stat().st_mtime_ns
+    except OSError:
+        configurations_mtime_ns = None
+
+    index_key = (str(store.directory), id_prefix)
+    mtimes = (locations_mtime_ns, configurations_mtime_ns)
+    with _indexes_lock:
+        cached = _indexes.get(index_key)
+        if cached is not None and cached[0] == mtimes:
+            return cached[1]
+
+        actions = list(store.load(id_prefix, STATIC_LOCATIONS_COLLECTION).records.values())
+        configurations = store.load(id_prefix, CONFIGURATIONS_COLLECTION).records if configurations_mtime_ns is not None else {}
+        index = ConfigurationLocationIndex(actions, configurations)
+        _indexes[index_key] = (mtimes, index)
+        logger.debug("Built location index of %s with %s configuration(s)", id_prefix, len(index))
+        return index
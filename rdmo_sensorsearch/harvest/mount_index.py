@@ -0,0 +1,125 @@
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from rdmo_sensorsearch.harvest.store import HarvestStore
+
+logger = logging.getLogger(__name__)
+
+MOUNT_ACTIONS_COLLECTION = "device-mount-actions"
+
+
+@dataclass(frozen=True)
+class MountPeriod:
+    """
+    One period in which a device was mounted in a configuration.
+    """
+
+    action_id: str
+    device_id: str
+    configuration_id: str
+    begin_date: str | None
+    end_date: str | None
+
+    @classmethod
+    def from_action(cls, action: dict[str, Any]) -> "MountPeriod | None":
+        relationships = action.get("relationships") or {}
+        device_id = ((relationships.get("device") or {}).get("data") or {}).get("id")
+        configuration_id = ((relationships.get("configuration") or {}).get("data") or {}).get("id")
+        if action.get("id") is None or device_id is None or configuration_id is None:
+            return None
+
+        attributes = action.get("attributes") or {}
+        return cls(
+            action_id=str(action["id"]),
+            device_id=str(device_id),
+            configuration_id=str(configuration_id),
+            begin_date=attributes.get("begin_date"),
+            end_date=attributes.get("end_date"),
+        )
+
+
+class DeviceMountIndex:
+    """
+    Reverse index from devices to the configurations they were mounted in,
+    built from the harvested `device-mount-actions` of one SMS instance.
+
+    The index keeps the harvested mount action records, so they can be used
+    wherever the mount actions of a device would otherwise be fetched from
+    the SMS.
+    """
+
+    def __init__(self, actions: list[dict[str, Any]]):
+        self._actions_by_device: dict[str, list[dict[str, Any]]] = {}
+        self._periods_by_device: dict[str, list[MountPeriod]] = {}
+        for action in actions:
+            period = MountPeriod.from_action(action)
+            if period is None:
+                continue
+            self._actions_by_device.setdefault(period.device_id, []).append(action)
+            self._periods_by_device.setdefault(period.device_id, []).append(period)
+
+        for periods in self._periods_by_device.values():
+            periods.sort(key=lambda period: period.begin_date or "")
+
+    def __len__(self) -> int:
+        return len(self._periods_by_device)
+
+    def actions(self, device_id: str, configuration_id: str | None = None) -> list[dict[str, Any]]:
+        actions = self._actions_by_device.get(str(device_id), [])
+        if configuration_id is None:
+            return list(actions)
+        return [
+            action
+            for action in actions
+            if ((action["relationships"].get("configuration") or {}).get("data") or {}).get("id") == configuration_id
+        ]
+
+    def periods(self, device_id: str) -> list[MountPeriod]:
+        """
+        Returns all mount periods of the device, ordered by their begin.
+        """
+        return list(self._periods_by_device.get(str(device_id), []))
+
+
+def indexed_device_mount_actions(id_prefix: str, device_id: str, configuration_id: str | None = None) -> list[dict[str, Any]]:
+    """
+    Returns the harvested mount actions of a device, optionally only those in
+    one configuration. The list is empty if nothing was harvested or the
+    harvest does not know the device yet, so callers can fall back to the SMS.
+    """
+    index = get_device_mount_index(id_prefix)
+    if index is None:
+        return []
+    return index.actions(device_id, configuration_id)
+
+
+_indexes: dict[tuple[str, str], tuple[int, DeviceMountIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_device_mount_index(id_prefix: str, store: HarvestStore | None = None) -> DeviceMountIndex | None:
+    """
+    Returns the mount index of the SMS instance with the id_prefix, or None if
+    its mount actions were never harvested. The index is rebuilt when the
+    harvested collection changes.
+    """
+    store = store or HarvestStore()
+    path = store.path_for(id_prefix, MOUNT_ACTIONS_COLLECTION)
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+    index_key = (str(store.directory), id_prefix)
+    with _indexes_lock:
+        cached = _indexes.get(index_key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        state = store.load(id_prefix, MOUNT_ACTIONS_COLLECTION)
+        index = DeviceMountIndex(list(state.records.values()))
+        _indexes[index_key] = (mtime_ns, index)
+        logger.debug("Built mount index of %s with %s device(s)", id_prefix, len(index))
+        return index
@@ -0,0 +1,10 @@
+from rdmo_sensorsearch.harvest.harvester_gfz_gipp import GeophysicalInstrumentPoolPotsdamHarvester
+from rdmo_sensorsearch.harvest.harvester_o2a_registry import O2ARegistryHarvester
+from rdmo_sensorsearch.harvest.harvester_sms import SensorManagementSystemHarvester
+
+# dict of known catalogue harvesters
+HARVESTER_REGISTRY = {
+    "O2ARegistryHarvester": O2ARegistryHarvester,
+    "SensorManagementSystemHarvester": SensorManagementSystemHarvester,
+    "GeophysicalInstrumentPoolPotsdamHarvester": GeophysicalInstrumentPoolPotsdamHarvester,
+}
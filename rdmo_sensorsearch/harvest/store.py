@@ -0,0 +1,93 @@
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class HarvestState:
+    """
+    Locally harvested records of one collection of one backend.
+
+    The watermark is the highest ``updated_at``-style value seen so far and is
+    used as lower bound for the next incremental harvest.
+    """
+
+    id_prefix: str
+    collection: str
+    watermark: str | None = None
+    harvested_at: str | None = None
+    records: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+def get_harvest_directory() -> Path:
+    try:
+        harvest_directory = settings.SENSORS_SEARCH_HARVEST_DIR
+    except AttributeError:
+        harvest_directory = None
+
+    harvest_directory = os.getenv("SENSORS_SEARCH_HARVEST_DIR", harvest_directory)
+    if harvest_directory is None:
+        harvest_directory = os.path.join(Path(__file__).parent.parent, "harvest_data")
+
+    return Path(harvest_directory)
+
+
+class HarvestStore:
+    """
+    Stores one JSON document per backend and collection below the harvest
+    directory.
+    """
+
+    def __init__(self, directory: str | Path | None = None):
+        self.directory = Path(directory) if directory is not None else get_harvest_directory()
+
+    def path_for(self, id_prefix: str, collection: str) -> Path:
+        return self.directory / id_prefix / f"{collection}.json"
+
+    def load(self, id_prefix: str, collection: str) -> HarvestState:
+        path = self.path_for(id_prefix, collection)
+        try:
+            with open(path, encoding="utf-8") as harvest_file:
+                data = json.load(harvest_file)
+        except FileNotFoundError:
+            return HarvestState(id_prefix=id_prefix, collection=collection)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error("Cannot read harvest state %s, starting from scratch: %s", path, e)
+            return HarvestState(id_prefix=id_prefix, collection=collection)
+
+        return HarvestState(
+            id_prefix=id_prefix,
+            collection=collection,
+            watermark=data.get("watermark"),
+            harvested_at=data.get("harvested_at"),
+            records=data.get("records", {}),
+        )
+
+    def save(self, state: HarvestState) -> None:
+        path = self.path_for(state.id_prefix, state.collection)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "watermark": state.watermark,
+            "harvested_at": state.harvested_at,
+            "records": state.records,
+        }
+
+        # write to a temporary file first, so that readers never see a partial document
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{state.collection}.", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp_file:
+                json.dump(data, tmp_file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        logger.debug("Saved %s harvested record(s) to %s", len(state.records), path)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from rdmo_sensorsearch.daemon import SensorSearchDaemon, get_daemon_socket_path
+
+
+class Command(BaseCommand):
+    help = "Run the sensor search daemon, which serves the searches of all workers over a Unix socket."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--socket", help="Path of the Unix socket (default: SENSORS_SEARCH_DAEMON_SOCKET).")
+
+    def handle(self, *args, **options):
+        socket_path = options["socket"] or get_daemon_socket_path()
+        if not socket_path:
+            raise CommandError("No socket configured, set SENSORS_SEARCH_DAEMON_SOCKET or pass --socket.")
+
+        try:
+            server = SensorSearchDaemon(socket_path)
+        except OSError as e:
+            raise CommandError(f"Cannot listen on {socket_path}: {e}") from e
+
+        self.stdout.write(f"Sensor search daemon listening on {socket_path}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from rdmo_sensorsearch.cache import is_shared_cache
+from rdmo_sensorsearch.harvest.base import HarvestError
+from rdmo_sensorsearch.harvest.factory import build_harvester_instances
+from rdmo_sensorsearch.harvest.store import HarvestStore
+from rdmo_sensorsearch.prewarm import invalidate_cached_details
+
+
+class Command(BaseCommand):
+    help = "Harvest the configured sensor registries into the local store, incrementally where possible."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Ignore the stored watermarks and harvest every collection completely.",
+        )
+        parser.add_argument(
+            "--id-prefix",
+            action="append",
+            dest="id_prefixes",
+            help="Only harvest the backend with this id_prefix, can be given multiple times.",
+        )
+        parser.add_argument("--directory", help="Override the harvest directory.")
+
+    def handle(self, *args, **options):
+        harvesters = build_harvester_instances()
+        if options["id_prefixes"]:
+            harvesters = [harvester for harvester in harvesters if harvester.id_prefix in options["id_prefixes"]]
+        if not harvesters:
+            raise CommandError("No harvesters configured, check the [harvest.harvesters] section of the configuration.")
+
+        store = HarvestStore(options["directory"])
+        failed = []
+        for harvester in harvesters:
+            try:
+                results = harvester.harvest(store, full=options["full"])
+            except HarvestError as e:
+                self.stderr.write(self.style.ERROR(f"{harvester.id_prefix}: {e}"))
+                failed.append(harvester.id_prefix)
+                continue
+
+            for result in results:
+                self.stdout.write(
+                    f"{result.id_prefix}/{result.collection} ({'incremental' if result.incremental else 'full'}): "
+                    f"{result.changed} changed, {result.deleted} deleted, {result.total} total"
+                )
+            if is_shared_cache():
+                self._invalidate_details(harvester.id_prefix, results)
+
+        if failed:
+            raise CommandError(f"Harvesting failed for: {', '.join(failed)}")
+
+    def _invalidate_details(self, id_prefix, results):
+        # the cached detail payloads of changed records are stale now
+        if any(not result.incremental or result.deleted for result in results):
+            invalidate_cached_details(id_prefix)
+            return
+        changed_ids = sorted({id_ for result in results for id_ in result.changed_ids})
+        if changed_ids:
+            invalidate_cached_details(id_prefix, changed_ids)
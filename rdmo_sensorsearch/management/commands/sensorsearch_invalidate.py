@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from rdmo_sensorsearch.cache import is_shared_cache
+from rdmo_sensorsearch.prewarm import invalidate_cached_details
+
+
+class Command(BaseCommand):
+    help = "Drop the cached detail payloads of changed sensors, so that the handlers fetch them again."
+
+    def add_arguments(self, parser):
+        parser.add_argument("external_ids", nargs="*", help="External ids to invalidate, e.g. 'sms:123'.")
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Invalidate all cached detail payloads (of the backend given by --id-prefix).",
+        )
+        parser.add_argument("--id-prefix", help="Only invalidate the backend with this id_prefix, together with --all.")
+
+    def handle(self, *args, **options):
+        if not is_shared_cache():
+            # the payloads are cached in the workers, not in this process
+            raise CommandError(
+                "The sensor search cache is local to each process, invalidating needs a cache shared with the RDMO "
+                "workers, see SENSORS_SEARCH_CACHE_ALIAS."
+            )
+
+        if options["all"]:
+            handlers = invalidate_cached_details(options["id_prefix"])
+            self.stdout.write(f"Invalidated all cached details of {handlers} handler(s).")
+            return
+
+        if not options["external_ids"]:
+            raise CommandError("No external ids given, use --all to invalidate all cached details.")
+
+        ids_by_prefix = {}
+        for external_id in options["external_ids"]:
+            id_prefix, separator, id_ = external_id.partition(":")
+            if not separator or not id_:
+                raise CommandError(f"Invalid external id {external_id!r}, expected '<id_prefix>:<id>'.")
+            ids_by_prefix.setdefault(id_prefix, []).append(id_)
+
+        for id_prefix, ids in ids_by_prefix.items():
+            handlers = invalidate_cached_details(id_prefix, ids)
+            if not handlers:
+                self.stderr.write(self.style.WARNING(f"No handler with a detail cache for id_prefix {id_prefix!r}."))
+        self.stdout.write(f"Invalidated {len(options['external_ids'])} external id(s).")
@@ -0,0 +1,55 @@
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from rdmo_sensorsearch.providers.meta_provider import META_PROVIDERS, SENSORSPROVIDER_CONFIG_KEY
+
+
+class Command(BaseCommand):
+    help = "Resolve many serial numbers or device ids to option ids at once."
+
+    def add_arguments(self, parser):
+        parser.add_argument("identifiers", nargs="*", help="Identifiers to resolve.")
+        parser.add_argument(
+            "--file",
+            help="Read the identifiers from this file, one per line. Use '-' for stdin.",
+        )
+        parser.add_argument(
+            "--kind",
+            help="Look up all identifiers as this kind (e.g. 'id' or 'serial') instead of using the lookup_patterns.",
+        )
+        parser.add_argument(
+            "--provider",
+            choices=sorted(META_PROVIDERS),
+            default=SENSORSPROVIDER_CONFIG_KEY,
+            help=f"The meta-provider whose providers are used (default: {SENSORSPROVIDER_CONFIG_KEY}).",
+        )
+        parser.add_argument("--json", action="store_true", help="Write the result as JSON.")
+
+    def handle(self, *args, **options):
+        identifiers = list(options["identifiers"])
+        if options["file"]:
+            try:
+                if options["file"] == "-":
+                    identifiers.extend(sys.stdin.read().splitlines())
+                else:
+                    with open(options["file"], encoding="utf-8") as f:
+                        identifiers.extend(f.read().splitlines())
+            except OSError as e:
+                raise CommandError(f"Could not read identifiers: {e}") from e
+        if not identifiers:
+            raise CommandError("No identifiers given.")
+
+        meta_provider = META_PROVIDERS[options["provider"]](options["provider"], "", "")
+        try:
+            results = meta_provider.bulk_lookup(identifiers, kind=options["kind"])
+        except ValueError as e:
+            raise CommandError(f"{e}, pass --kind (e.g. 'id' or 'serial').") from e
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+
+        for identifier, option_ids in results.items():
+            self.stdout.write("\t".join([identifier, *option_ids]))
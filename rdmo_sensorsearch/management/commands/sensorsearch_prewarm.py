@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from rdmo_sensorsearch.cache import is_shared_cache
+from rdmo_sensorsearch.prewarm import prewarm_details, prewarm_searches
+
+
+class Command(BaseCommand):
+    help = "Refresh the cached responses of the most popular searches and selected sensors."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--searches",
+            type=int,
+            default=50,
+            help="Number of popular search terms to refresh (default: 50).",
+        )
+        parser.add_argument(
+            "--details",
+            type=int,
+            default=50,
+            help="Number of popular selected external ids to refresh (default: 50).",
+        )
+
+    def handle(self, *args, **options):
+        if not is_shared_cache():
+            # the counts and the refreshed responses would stay in this process
+            raise CommandError(
+                "The sensor search cache is local to each process, prewarming needs a cache shared with the RDMO workers, "
+                "see SENSORS_SEARCH_CACHE_ALIAS."
+            )
+
+        searches = prewarm_searches(options["searches"]) if options["searches"] > 0 else 0
+        details = prewarm_details(options["details"]) if options["details"] > 0 else 0
+        self.stdout.write(f"Refreshed {searches} search term(s) and {details} external id(s).")
@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from rdmo_sensorsearch.harvest.columnar import SNAPSHOT_FORMATS, SnapshotError, export_snapshots, import_snapshot
+from rdmo_sensorsearch.harvest.factory import build_harvester_instances
+from rdmo_sensorsearch.harvest.store import HarvestStore
+
+
+class Command(BaseCommand):
+    help = "Export harvested catalogues as columnar Parquet/Arrow snapshots, or import such snapshots."
+
+    def add_arguments(self, parser):
+        subparsers = parser.add_subparsers(dest="action", required=True)
+
+        export_parser = subparsers.add_parser("export", help="Write one snapshot file per harvested collection.")
+        export_parser.add_argument("output", help="Directory for the snapshot files.")
+        export_parser.add_argument(
+            "--format",
+            choices=sorted(SNAPSHOT_FORMATS),
+            default="parquet",
+            help="File format of the snapshots (default: parquet).",
+        )
+        export_parser.add_argument(
+            "--id-prefix",
+            action="append",
+            dest="id_prefixes",
+            help="Only export the backend with this id_prefix, can be given multiple times.",
+        )
+        export_parser.add_argument("--directory", help="Override the harvest directory.")
+
+        import_parser = subparsers.add_parser("import", help="Restore the harvest store from snapshot files.")
+        import_parser.add_argument("files", nargs="+", help="Snapshot files to import.")
+        import_parser.add_argument("--directory", help="Override the harvest directory.")
+
+    def handle(self, *args, **options):
+        store = HarvestStore(options["directory"])
+        try:
+            if options["action"] == "export":
+                self._export(store, options)
+            else:
+                self._import(store, options)
+        except SnapshotError as e:
+            raise CommandError(str(e)) from e
+
+    def _export(self, store: HarvestStore, options: dict) -> None:
+        harvesters = build_harvester_instances()
+        if options["id_prefixes"]:
+            harvesters = [harvester for harvester in harvesters if harvester.id_prefix in options["id_prefixes"]]
+        if not harvesters:
+            raise CommandError("No harvesters configured, check the [harvest.harvesters] section of the configuration.")
+
+        for path in export_snapshots(harvesters, store, options["output"], options["format"]):
+            self.stdout.write(f"Wrote {path}")
+
+    def _import(self, store: HarvestStore, options: dict) -> None:
+        for path in options["files"]:
+            state = import_snapshot(path, store)
+            self.stdout.write(f"Imported {len(state.records)} record(s) of {state.id_prefix}/{state.collection} from {path}")
@@ -0,0 +1,126 @@
+import contextvars
+import itertools
+import logging
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from rdmo_sensorsearch.client import fetch_json
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def iter_pages(
+    page_urls: Iterator[str],
+    is_last_page: Callable[[Any], bool],
+    fetch: Callable[[str], Any] = fetch_json,
+) -> Iterator[Any]:
+    """
+    Yields the payloads of consecutive pages.
+
+    Pages are fetched lazily: while the consumer processes one page, the next
+    one is already fetched in the background, and nothing more is requested
+    once the consumer stops iterating. A page with errors is yielded and ends
+    the iteration, so callers can handle it like the result of `fetch_json`.
+
+    Args:
+        page_urls (Iterator):       The URLs of the pages in order.
+        is_last_page (Callable):    Returns whether a page payload is the last one.
+        fetch (Callable):           Fetches the payload of one URL.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sensorsearch-pages")
+    try:
+        url = next(page_urls, None)
+        pending = executor.submit(contextvars.copy_context().run, fetch, url) if url else None
+        while pending is not None:
+            page = pending.result()
+            pending = None
+
+            if (isinstance(page, dict) and "errors" in page) or is_last_page(page):
+                yield page
+                return
+
+            next_url = next(page_urls, None)
+            if next_url == url:
+                # the URL template has no page placeholder
+                logger.warning("Cannot paginate %s, the page URL does not change", url)
+                yield page
+                return
+            url = next_url
+            if url:
+                pending = executor.submit(contextvars.copy_context().run, fetch, url)
+            yield page
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def iter_jsonapi_pages(url_template: str, page_size: int = DEFAULT_PAGE_SIZE, **url_kwargs) -> Iterator[dict]:
+    """
+    Yields the pages of a JSON:API collection, e.g. of the SMS. The URL
+    template must contain `{page_size}` and `{page_number}` placeholders.
+    """
+    page_urls = (
+        url_template.format(page_size=page_size, page_number=page_number, **url_kwargs) for page_number in itertools.count(1)
+    )
+
+    def is_last_page(page) -> bool:
+        if not isinstance(page, dict):
+            return True
+        data = page.get("data")
+        return not isinstance(data, list) or len(data) < page_size or not (page.get("links") or {}).get("next")
+
+    return iter_pages(page_urls, is_last_page)
+
+
+def iter_o2a_pages(url_template: str, page_size: int = DEFAULT_PAGE_SIZE, **url_kwargs) -> Iterator[dict | list]:
+    """
+    Yields the pages of an O2A Registry collection. The URL template must
+    contain `{offset}` and `{page_size}` placeholders.
+    """
+    page_urls = (
+        url_template.format(offset=offset, page_size=page_size, **url_kwargs) for offset in itertools.count(0, page_size)
+    )
+    offset = 0
+
+    def is_last_page(page) -> bool:
+        nonlocal offset
+        records = o2a_records(page)
+        offset += len(records)
+        total = page.get("totalRecords") if isinstance(page, dict) else None
+        return len(records) < page_size or (isinstance(total, int) and offset >= total)
+
+    return iter_pages(page_urls, is_last_page)
+
+
+def iter_records(pages: Iterator[Any], records: Callable[[Any], list], max_records: int | None = None) -> Iterator[dict]:
+    """
+    Yields the records of the pages, at most `max_records` (None for all).
+    An error page is logged and ends the records.
+    """
+    count = 0
+    try:
+        for page in pages:
+            if isinstance(page, dict) and "errors" in page:
+                logger.warning("Stopping pagination after an error: %s", page["errors"])
+                return
+            for record in records(page):
+                if max_records is not None and count >= max_records:
+                    return
+                count += 1
+                yield record
+    finally:
+        pages.close()
+
+
+def jsonapi_records(page) -> list:
+    data = page.get("data", []) if isinstance(page, dict) else []
+    return data if isinstance(data, list) else []
+
+
+def o2a_records(page) -> list:
+    if isinstance(page, dict):
+        records = page.get("records", [])
+        return records if isinstance(records, list) else []
+    return page if isinstance(page, list) else []
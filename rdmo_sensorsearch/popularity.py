@@ -0,0 +1,125 @@
+import json
+import logging
+
+from django.conf import settings
+
+from rdmo_sensorsearch.cache import get_cache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+SEARCH_KIND = "search"
+DETAIL_KIND = "detail"
+MAX_ENTRIES = 1000
+# how long a search result waits for one of its options to be selected
+PENDING_SEARCH_TIMEOUT = 30 * 60
+
+
+def is_recording_enabled() -> bool:
+    try:
+        return bool(settings.SENSORS_SEARCH_RECORD_POPULARITY)
+    except AttributeError:
+        return True
+
+
+def record_hit(kind: str, *parts: str) -> None:
+    """
+    Counts one hit of a search term or a resolved external id.
+
+    The counts are anonymous: neither the user nor the project is stored, only
+    the parts themselves. Every entry has its own counter in the plugin cache,
+    which is incremented atomically. The entries are listed in a registry per
+    kind, which is only written when an entry is new or its count reaches a
+    power of two, so a registration lost to a concurrent write is repaired
+    while the entry becomes popular. Only the `MAX_ENTRIES` most frequent
+    entries are kept.
+    """
+    if not is_recording_enabled():
+        return
+
+    cache = get_cache()
+    entry = json.dumps(parts)
+    counter_key = _counter_key(kind, entry)
+    cache.add(counter_key, 0, None)
+    try:
+        count = cache.incr(counter_key)
+    except ValueError:
+        # evicted between add and incr
+        cache.set(counter_key, 1, None)
+        count = 1
+
+    if count & (count - 1) == 0:
+        _register_entry(kind, entry)
+
+
+def record_search_results(config_key: str, project_id, search: str, option_ids: list[str]) -> None:
+    """
+    Remembers the search term that found the options of a search result, so
+    that it is counted by `record_selection` once one of them is selected.
+    Search terms typed on the way to the final one are never counted.
+    """
+    if not is_recording_enabled() or project_id is None or not option_ids:
+        return
+
+    pending = {_pending_key(project_id, option_id): [config_key, search] for option_id in option_ids}
+    get_cache().set_many(pending, PENDING_SEARCH_TIMEOUT)
+
+
+def record_selection(catalog_uri: str, attribute_uri: str, project_id, external_id: str) -> None:
+    """
+    Counts a selected external id and the search term which found it.
+    """
+    if not is_recording_enabled():
+        return
+
+    record_hit(DETAIL_KIND, catalog_uri, attribute_uri, external_id)
+    if project_id is None:
+        return
+
+    cache = get_cache()
+    pending_key = _pending_key(project_id, external_id)
+    pending = cache.get(pending_key)
+    if pending is not None:
+        cache.delete(pending_key)
+        record_hit(SEARCH_KIND, *pending)
+
+
+def get_top_hits(kind: str, limit: int) -> list[tuple[tuple[str, ...], int]]:
+    """
+    Returns the `limit` most frequent entries of a kind with their counts.
+    """
+    counts = _get_counts(kind, get_cache().get(_registry_key(kind)) or [])
+    top = sorted(counts.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [(tuple(json.loads(entry)), count) for entry, count in top]
+
+
+def _register_entry(kind: str, entry: str) -> None:
+    cache = get_cache()
+    registry_key = _registry_key(kind)
+    entries = cache.get(registry_key) or []
+    if entry in entries:
+        return
+
+    entries.append(entry)
+    if len(entries) > MAX_ENTRIES:
+        counts = _get_counts(kind, entries)
+        kept = set(sorted(counts, key=counts.get, reverse=True)[: MAX_ENTRIES // 2])
+        cache.delete_many([_counter_key(kind, dropped) for dropped in entries if dropped not in kept])
+        entries = [kept_entry for kept_entry in entries if kept_entry in kept]
+    cache.set(registry_key, entries, None)
+
+
+def _get_counts(kind: str, entries: list[str]) -> dict[str, int]:
+    counter_keys = {_counter_key(kind, entry): entry for entry in entries}
+    return {counter_keys[key]: count for key, count in get_cache().get_many(list(counter_keys)).items()}
+
+
+def _registry_key(kind: str) -> str:
+    return make_cache_key("popularity", kind)
+
+
+def _counter_key(kind: str, entry: str) -> str:
+    return make_cache_key("popularity-count", kind, entry)
+
+
+def _pending_key(project_id, option_id: str) -> str:
+    return make_cache_key("popularity-pending", project_id, option_id)
@@ -0,0 +1,173 @@
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from rdmo_sensorsearch.cache import get_cache, is_shared_cache, make_cache_key
+from rdmo_sensorsearch.client import refreshing_responses
+from rdmo_sensorsearch.popularity import DETAIL_KIND, SEARCH_KIND, get_top_hits
+from rdmo_sensorsearch.snapshot import get_config_snapshot
+
+logger = logging.getLogger(__name__)
+
+PREFETCH_WORKERS = 2
+
+_prefetch_executor = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="sensorsearch-prefetch")
+
+
+def prewarm_searches(limit: int) -> int:
+    """
+    Refreshes the cached backend responses of the `limit` most popular search
+    terms. Returns the number of search terms refreshed.
+    """
+    snapshot = get_config_snapshot()
+    refreshed = 0
+
+    with refreshing_responses():
+        for (config_key, search), count in get_top_hits(SEARCH_KIND, limit):
+            logger.debug("Prewarming search %r of %s (%s hits)", search, config_key, count)
+            for provider in snapshot.get_providers(config_key):
+                try:
+                    kind = _lookup_kind(provider, search)
+                    if kind is not None:
+                        provider.lookup_hits(kind, search)
+                    else:
+                        provider.search_hits(None, search)
+                except Exception:
+                    logger.exception("Prewarming search %r failed for %r", search, provider)
+            refreshed += 1
+
+    return refreshed
+
+
+def prewarm_details(limit: int) -> int:
+    """
+    Refreshes the cached detail payloads of the `limit` most popular external
+    ids, for the handlers with a detail cache. Returns the number of external
+    ids refreshed.
+    """
+    snapshot = get_config_snapshot()
+    refreshed = 0
+
+    with refreshing_responses():
+        for (catalog_uri, attribute_uri, external_id), count in get_top_hits(DETAIL_KIND, limit):
+            candidates = [
+                candidate
+                for candidate in _get_detail_candidates(snapshot, catalog_uri, external_id)
+                if candidate.auto_complete_field_uri == attribute_uri and candidate.handler.caches_details
+            ]
+            if not candidates:
+                continue
+
+            logger.debug("Prewarming details of %s (%s hits)", external_id, count)
+            _fetch_details(candidates, external_id)
+            refreshed += 1
+
+    return refreshed
+
+
+def prefetch_details(catalog_uri: str, external_ids: list[str], user_id, budget: int) -> None:
+    """
+    Fetches the handler details of options the user is likely to select into
+    the detail cache, in the background.
+
+    Only `prefetchable` handlers, which resolve a single device with a few
+    requests, and only those with a detail cache are prefetched;
+    configurations and missions are not. At most
+    `budget` external ids are prefetched per user and minute, further ids are
+    skipped. The budget and the prefetched responses have to be shared with
+    the other workers, so nothing is prefetched with a process-local cache.
+    """
+    if not is_shared_cache():
+        return
+
+    snapshot = get_config_snapshot()
+    for external_id in external_ids:
+        candidates = _unique_handlers(
+            [
+                candidate
+                for candidate in _get_detail_candidates(snapshot, catalog_uri, external_id)
+                if getattr(candidate.handler, "prefetchable", False) and candidate.handler.caches_details
+            ]
+        )
+        if not candidates:
+            continue
+        if not _consume_prefetch_budget(user_id, budget):
+            logger.debug("Prefetch budget of user %s is exhausted", user_id)
+            return
+        _prefetch_executor.submit(_fetch_details, candidates, external_id)
+
+
+def invalidate_cached_details(id_prefix: str | None = None, ids: list[str] | None = None) -> int:
+    """
+    Drops the cached detail payloads of the handlers with a detail cache, e.g.
+    after the records were changed in the registry. The handlers fetch the
+    records live, so the next selection requests them from the registry
+    again. Returns the number of handlers invalidated.
+
+    Args:
+        id_prefix (str, optional): Only invalidate the handlers of this prefix.
+        ids (list[str], optional): Only drop the payloads of these record ids
+            (without prefix), instead of all payloads of the handlers.
+    """
+    snapshot = get_config_snapshot()
+    candidates = _unique_handlers(
+        [
+            candidate
+            for candidates in (*snapshot.handlers_by_catalog.values(), *snapshot.handler_candidates_by_catalog.values())
+            for candidate in candidates
+            if (id_prefix is None or candidate.id_prefix == id_prefix) and candidate.handler.caches_details
+        ]
+    )
+    for candidate in candidates:
+        if ids is None:
+            candidate.handler.invalidate_detail()
+        else:
+            for id_ in ids:
+                candidate.handler.invalidate_detail(id_)
+    return len(candidates)
+
+
+def _get_detail_candidates(snapshot, catalog_uri: str, external_id: str) -> list:
+    id_prefix = external_id.partition(":")[0]
+    return [candidate for candidate in snapshot.get_handler_candidates(catalog_uri) if candidate.id_prefix == id_prefix]
+
+
+def _unique_handlers(candidates: list) -> list:
+    seen = set()
+    unique = []
+    for candidate in candidates:
+        key = (type(candidate.handler), candidate.handler.base_url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(candidate)
+    return unique
+
+
+def _fetch_details(candidates: list, external_id: str) -> None:
+    id_ = external_id.partition(":")[2]
+    for candidate in candidates:
+        try:
+            candidate.handler.handle(id_=id_, instance=None)
+        except Exception:
+            logger.exception("Fetching details of %s failed for %s", external_id, candidate.id_prefix)
+
+
+def _consume_prefetch_budget(user_id, budget: int) -> bool:
+    cache = get_cache()
+    cache_key = make_cache_key("prefetch-budget", user_id, int(time.time() // 60))
+    cache.add(cache_key, 0, 60)
+    try:
+        return cache.incr(cache_key) <= budget
+    except ValueError:
+        return False
+
+
+def _lookup_kind(provider, search: str) -> str | None:
+    for kind, pattern in (getattr(provider, "lookup_patterns", None) or {}).items():
+        try:
+            if re.fullmatch(pattern, search):
+                return kind
+        except re.error:
+            continue
+    return None
@@ -1,10 +1,78 @@
 import logging
+import re
+from dataclasses import dataclass
 
 from rdmo.options.providers import Provider
 
+from rdmo_sensorsearch.spatial import SpatialQuery
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class SearchHit:
+    """
+    One search result of a provider.
+
+    ``option`` is the option dictionary handed to RDMO, ``haystack`` the
+    searchable text of the underlying record, which is used to refine a
+    cached result set locally. ``serial_number``, ``manufacturer`` and
+    ``model`` identify the physical sensor, so that the meta providers can
+    collapse the same sensor found in several registries. ``distance_km``
+    is set by spatial searches for `near:` queries.
+    """
+
+    option: dict[str, str]
+    haystack: str = ""
+    serial_number: str | None = None
+    manufacturer: str | None = None
+    model: str | None = None
+    distance_km: float | None = None
+
+    def matches(self, search: str) -> bool:
+        if search.casefold() in f"{self.option.get('text', '')} {self.haystack}".casefold():
+            return True
+        serial_number = normalize_identifier(self.serial_number)
+        return bool(serial_number) and serial_number == normalize_identifier(search)
+
+    def is_duplicate_of(self, other: "SearchHit") -> bool:
+        """
+        Two hits describe the same physical sensor if their serial numbers
+        match and they share the manufacturer or the model.
+        """
+        serial_number = normalize_identifier(self.serial_number)
+        if not serial_number or serial_number != normalize_identifier(other.serial_number):
+            return False
+
+        for key in ("manufacturer", "model"):
+            value = normalize_identifier(getattr(self, key))
+            if value and value == normalize_identifier(getattr(other, key)):
+                return True
+        return False
+
+
+def normalize_identifier(value) -> str:
+    """
+    Normalizes serial numbers, manufacturer and model names for comparison,
+    e.g. "SN 00-12" and "sn0012" are equal.
+    """
+    if value is None:
+        return ""
+    return re.sub(r"[\W_]+", "", str(value).casefold())
+
+
+def group_identifiers(identifiers: list[str]) -> dict[str, list[str]]:
+    """
+    Groups identifiers by their normalized form, so that a record matched by
+    a bulk lookup is assigned to every identifier it matches, e.g. to both
+    "SN-12" and "sn12".
+    """
+    groups: dict[str, list[str]] = {}
+    for identifier in identifiers:
+        groups.setdefault(normalize_identifier(identifier), []).append(identifier)
+    return groups
+
+
 class BaseSensorProvider(Provider):
     """
     A common base class for sensor providers.
@@ -16,8 +84,25 @@ class BaseSensorProvider(Provider):
     - max_hits
 
     These can be optionally overridden at instantiation.
+
+    `lookup_patterns` maps a lookup kind (e.g. "id" or "serial") to a regular
+    expression. A search term fully matching one of the patterns is answered
+    with `lookup_hits` instead of a full-text search. `bulk_lookup_hits`
+    resolves up to `bulk_batch_size` identifiers of one kind at once.
+    `spatial_hits` answers map-based searches (see `parse_spatial_query`).
+
+    With `supports_local_refinement`, the meta providers may filter a complete
+    result set locally with `SearchHit.matches` while the user keeps typing.
+    Only providers whose hits carry every field their search looks at may set
+    it; a backend full-text search usually covers more fields than the option.
+    `can_refine` restricts it to the search terms whose results are the
+    matching hits of the previous search term.
     """
 
+    lookup_patterns: dict[str, str] = {}
+    bulk_batch_size = 50
+    supports_local_refinement = False
+
     def __init__(
         self,
         id_prefix: str | None = None,
@@ -67,6 +152,90 @@ class BaseSensorProvider(Provider):
             raise NotImplementedError(f"{type(self).__name__} must define `max_hits`")
         return value
 
+    def get_options(self, project, search=None, user=None, site=None):
+        return [hit.option for hit in self.search_hits(project, search, user, site) or []]
+
+    def search_hits(self, project, search=None, user=None, site=None) -> list[SearchHit] | None:
+        """
+        Searches the backend and returns the results as search hits.
+
+        Args:
+            project (Project):      The RDMO project object.
+            search (str, optional): Search term to query the backend.
+                                    Defaults to None.
+            user (User, optional):  Current user object.
+            site (Site, optional):  Site object.
+
+        Returns:
+            list | None: A list of SearchHit objects, or None if the backend
+                         request failed, so that callers can tell a failure
+                         from a search without results.
+        """
+        raise NotImplementedError(f"{type(self).__name__} must implement `search_hits`")
+
+    def lookup_hits(self, kind: str, identifier: str) -> list[SearchHit] | None:
+        """
+        Looks up records directly by an identifier, e.g. with a single GET on
+        the record URL instead of a full-text search.
+
+        Args:
+            kind (str):         The kind of identifier, e.g. "id" or "serial".
+            identifier (str):   The identifier to look up.
+
+        Returns:
+            list | None: A list of SearchHit objects, or None if the provider
+                         does not support lookups of this kind.
+        """
+        return None
+
+    def can_refine(self, previous_search: str, search: str) -> bool:
+        """
+        Returns whether the hits for `search` can be filtered from the complete
+        hits for `previous_search`, both normalized by the meta provider.
+        """
+        return self.supports_local_refinement and search.startswith(previous_search)
+
+    def bulk_lookup_hits(self, kind: str, identifiers: list[str]) -> dict[str, list[SearchHit]] | None:
+        """
+        Looks up many identifiers of the same kind.
+
+        The default implementation calls `lookup_hits` for every identifier,
+        providers with a filter for several values override it to resolve a
+        batch with a single request.
+
+        Args:
+            kind (str):                 The kind of identifier, e.g. "id" or "serial".
+            identifiers (list[str]):    The identifiers to look up.
+
+        Returns:
+            dict | None: The hits per identifier, or None if the provider
+                         does not support lookups of this kind.
+        """
+        results = {}
+        for identifier in identifiers:
+            hits = self.lookup_hits(kind, identifier)
+            if hits is None:
+                return None
+            results[identifier] = hits
+        return results
+
+    def spatial_hits(self, query: SpatialQuery) -> list[SearchHit] | None:
+        """
+        Searches records by their location.
+
+        Args:
+            query (SpatialQuery):   A bounding box or nearest neighbour query.
+
+        Returns:
+            list | None: A list of SearchHit objects, or None if the provider
+                         does not support spatial searches.
+        """
+        return None
+
+    @property
+    def cache_key(self) -> str:
+        return f"{type(self).__name__}:{self.id_prefix}:{self.base_url}"
+
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__name__}:id={self.id_prefix}, "
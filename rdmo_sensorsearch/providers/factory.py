@@ -6,17 +6,19 @@ from rdmo_sensorsearch.providers.registry import PROVIDER_REGISTRY
 logger = logging.getLogger(__name__)
 
 
-def build_provider_instances(config_section_name: str) -> list:
+def build_provider_instances(config_section_name: str, configuration: dict | None = None) -> list:
     """
     Factory method to create provider instances from config.
 
     Args:
         config_section_name (str): Name of the top-level section in config, usually the provider class name.
+        configuration (dict, optional): The configuration to use. Defaults to the loaded configuration file.
 
     Returns:
         list: List of instantiated provider objects.
     """
-    configuration = load_config()
+    if configuration is None:
+        configuration = load_config()
     section_config = configuration.get(config_section_name, {})
     provider_definitions = section_config.get("providers", {})
     provider_defaults = section_config.get("provider_defaults", {})
@@ -1,17 +1,38 @@
+import heapq
 import logging
+import re
+from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 
 from rdmo.options.providers import Provider
 from rdmo.projects.models import Value
 
-from rdmo_sensorsearch.config import get_config_file_path, load_config
-from rdmo_sensorsearch.providers.factory import build_provider_instances
+from rdmo_sensorsearch.cache import bump_version, get_cache, get_invalidated_timeout, get_version, make_cache_key
+from rdmo_sensorsearch.config import get_config_file_path
+from rdmo_sensorsearch.daemon import DaemonError, call_daemon, is_daemon_enabled
+from rdmo_sensorsearch.popularity import record_search_results
+from rdmo_sensorsearch.prewarm import prefetch_details
+from rdmo_sensorsearch.providers.base import SearchHit, normalize_identifier
+from rdmo_sensorsearch.snapshot import get_config_snapshot
+from rdmo_sensorsearch.spatial import SpatialQuery, parse_spatial_query
 
 logger = logging.getLogger(__name__)
 
 SENSORSPROVIDER_CONFIG_KEY = "SensorsProvider"
 CONFIGURATIONSPROVIDER_CONFIG_KEY = "ConfigurationsProvider"
 CONFIGURATION_SEARCH_ATTRIBUTE_URI = "https://rdmo.nfdi4earth.de/terms/domain/configuration-set/configuration-search"
+REFINEMENT_CACHE_TIMEOUT = 300
+MAX_RESULTS = 20
+PREFETCH_BUDGET = 30
+ALLOWED_SMS_PREFIXES_CACHE_TIMEOUT = 24 * 60 * 60
+ALLOWED_SMS_PREFIXES_NAMESPACE = "allowed-sms-prefixes"
+
+
+@dataclass(frozen=True)
+class QueryRoute:
+    provider: Provider
+    kind: str
 
 
 class BaseMetaProvider(Provider):
@@ -25,9 +46,25 @@ class BaseMetaProvider(Provider):
         if self.config_key is None:
             raise NotImplementedError(f"{type(self).__name__} must define `config_key`")
 
-        configuration = load_config()
-        min_search_len = configuration.get(self.config_key, {}).get("min_search_len", 3)
-        providers = build_provider_instances(self.config_key)
+        if is_daemon_enabled():
+            try:
+                return call_daemon(
+                    "get_options",
+                    config_key=self.config_key,
+                    search=search,
+                    project_id=getattr(project, "pk", None),
+                    user_id=getattr(user, "pk", None),
+                )
+            except DaemonError as e:
+                logger.debug("%s searches in-process: %s", type(self).__name__, e)
+
+        snapshot = get_config_snapshot()
+        configuration = snapshot.configuration
+        section_config = configuration.get(self.config_key, {})
+        min_search_len = section_config.get("min_search_len", 3)
+        refinement_cache_timeout = section_config.get("refinement_cache_timeout", REFINEMENT_CACHE_TIMEOUT)
+        max_results = section_config.get("max_results", MAX_RESULTS)
+        providers = snapshot.get_providers(self.config_key)
         providers = self._filter_providers_for_project(project, providers)
 
         logger.debug(
@@ -58,24 +95,317 @@ class BaseMetaProvider(Provider):
         logger.debug("Configuration top-level keys: %s", sorted(configuration.keys()))
         logger.debug("Search term: %s", search)
 
-        results = []
+        spatial_query = parse_spatial_query(search) if self.config_key == CONFIGURATIONSPROVIDER_CONFIG_KEY else None
+        if spatial_query is not None:
+            results = [hit.option for hit in self._spatial_search(providers, spatial_query, max_results)]
+            logger.debug("Spatial search results: %s", results)
+            return results
+
+        routes = self._classify_query(providers, search)
+        if routes:
+            identifier = search.strip()
+            hits = self._merge_hits(
+                self._collect_hits([(route.provider, route.provider.lookup_hits, (route.kind, identifier)) for route in routes]),
+                search,
+                max_results,
+            )
+            if hits:
+                results = [hit.option for hit in hits]
+                logger.debug("Direct lookup results: %s", results)
+                self._record_search_results(project, search, results)
+                self._prefetch_details(project, user, results, section_config)
+                return results
+            logger.debug("Direct lookups for %r found nothing, falling back to search", identifier)
+
+        hits = self._merge_hits(
+            self._collect_hits(
+                [
+                    (provider, self._search_provider, (provider, project, search, user, site, refinement_cache_timeout))
+                    for provider in providers
+                ]
+            ),
+            search,
+            max_results,
+        )
+        results = [hit.option for hit in hits]
+        if results:
+            self._record_search_results(project, search, results)
+            self._prefetch_details(project, user, results, section_config)
+
+        logger.debug("Results: %s", results)
+        return results
+
+    def bulk_lookup(self, identifiers: list[str], kind: str | None = None, project=None) -> dict[str, list[str]]:
+        """
+        Resolves many identifiers, like pasted lists of serial numbers or
+        device ids, to option ids.
+
+        The identifiers are stripped and deduplicated. Without `kind`, every
+        identifier is routed by the `lookup_patterns` of the providers, with
+        `kind` it is looked up as this kind on every provider. The identifiers
+        are sent to each provider in batches of its `bulk_batch_size`, the
+        batches of all providers run concurrently.
+
+        Args:
+            identifiers (list[str]):    The identifiers to resolve.
+            kind (str, optional):       The lookup kind for all identifiers,
+                                        e.g. "id" or "serial".
+            project (Project, optional): Restricts the providers like a search
+                                        in this project.
+
+        Returns:
+            dict: The option ids per identifier, in the order of the
+                  identifiers. Unresolved identifiers map to an empty list.
+
+        Raises:
+            ValueError: If `kind` is None and no provider has `lookup_patterns`.
+        """
+        if self.config_key is None:
+            raise NotImplementedError(f"{type(self).__name__} must define `config_key`")
+
+        unique_identifiers = list(dict.fromkeys(identifier.strip() for identifier in identifiers if identifier.strip()))
+        providers = self._filter_providers_for_project(project, get_config_snapshot().get_providers(self.config_key))
+        if kind is None and not any(getattr(provider, "lookup_patterns", None) for provider in providers):
+            raise ValueError(f"No provider of {self.config_key} has lookup_patterns")
+
+        batches: dict[tuple[int, str], list[str]] = {}
+        unrouted = 0
+        for identifier in unique_identifiers:
+            if kind is not None:
+                routes = [QueryRoute(provider=provider, kind=kind) for provider in providers]
+            else:
+                routes = self._classify_query(providers, identifier)
+                unrouted += not routes
+            for route in routes:
+                batches.setdefault((providers.index(route.provider), route.kind), []).append(identifier)
+        if unrouted:
+            logger.warning("%s identifier(s) match no lookup pattern of %s and are not looked up", unrouted, self.config_key)
 
+        calls = []
+        for (provider_index, lookup_kind), batch_identifiers in batches.items():
+            provider = providers[provider_index]
+            batch_size = getattr(provider, "bulk_batch_size", 50)
+            for start in range(0, len(batch_identifiers), batch_size):
+                calls.append(
+                    (provider_index, provider, lookup_kind, batch_identifiers[start : start + batch_size]),
+                )
+
+        hits_by_identifier = {identifier: [[] for _ in providers] for identifier in unique_identifiers}
         with ThreadPoolExecutor(max_workers=4) as executor:
-            future_to_provider = {
-                executor.submit(provider.get_options, project, search, user, site): provider for provider in providers
+            future_to_call = {
+                executor.submit(provider.bulk_lookup_hits, lookup_kind, batch_identifiers): (provider_index, provider)
+                for provider_index, provider, lookup_kind, batch_identifiers in calls
             }
+            for future in as_completed(future_to_call):
+                provider_index, provider = future_to_call[future]
+                try:
+                    batch_results = future.result() or {}
+                except Exception as e:
+                    logger.warning("Provider %s failed with exception: %s", provider.__class__.__name__, e)
+                    continue
+                for identifier, hits in batch_results.items():
+                    hits_by_identifier[identifier][provider_index].extend(hits)
+
+        return {
+            identifier: [hit.option["id"] for hit in self._merge_hits(results, identifier, 0)]
+            for identifier, results in hits_by_identifier.items()
+        }
+
+    def _collect_hits(self, calls: list[tuple[Provider, Callable, tuple]]) -> list[list[SearchHit]]:
+        """
+        Runs the provider calls concurrently and returns their hits, one list
+        per call in the order of the calls. Failing providers are logged and
+        return no hits.
+        """
+        results: list[list[SearchHit]] = [[] for _ in calls]
 
-            for future in as_completed(future_to_provider):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            future_to_index = {executor.submit(function, *args): index for index, (_, function, args) in enumerate(calls)}
+
+            for future in as_completed(future_to_index):
+                index = future_to_index[future]
                 try:
-                    result = future.result()
-                    results.extend(result)
+                    results[index] = future.result() or []
                 except Exception as e:
-                    provider = future_to_provider[future]
+                    provider = calls[index][0]
                     logger.warning("Provider %s failed with exception: %s", provider.__class__.__name__, e)
 
-        logger.debug("Results: %s", results)
         return results
 
+    def _merge_hits(self, results: list[list[SearchHit]], search: str, max_results: int) -> list[SearchHit]:
+        """
+        Merges the hits of all providers into one list of at most
+        `max_results` hits, ordered by relevance.
+
+        Hits describing the same physical sensor in several registries are
+        collapsed into the most relevant one. The remaining hits are ranked by
+        how well they match the search term, then by their position in the
+        provider's result list and by the provider order. A `max_results` of
+        `0` disables the cap.
+        """
+        query = search.strip().casefold()
+
+        kept: list[tuple[tuple[int, int, int], SearchHit]] = []
+        by_serial_number: dict[str, list[int]] = {}
+        for provider_index, hits in enumerate(results):
+            for rank, hit in enumerate(hits):
+                entry = ((self._relevance_score(hit, query), -rank, -provider_index), hit)
+
+                serial_number = normalize_identifier(hit.serial_number)
+                if not serial_number:
+                    kept.append(entry)
+                    continue
+
+                candidates = by_serial_number.setdefault(serial_number, [])
+                duplicate_index = next((i for i in candidates if hit.is_duplicate_of(kept[i][1])), None)
+                if duplicate_index is None:
+                    candidates.append(len(kept))
+                    kept.append(entry)
+                    continue
+
+                logger.debug("Collapsing duplicate hit %s into %s", hit.option, kept[duplicate_index][1].option)
+                if entry[0] > kept[duplicate_index][0]:
+                    kept[duplicate_index] = entry
+
+        if max_results:
+            ranked = heapq.nlargest(max_results, kept, key=lambda entry: entry[0])
+        else:
+            ranked = sorted(kept, key=lambda entry: entry[0], reverse=True)
+        return [hit for _, hit in ranked]
+
+    def _relevance_score(self, hit: SearchHit, query: str) -> int:
+        """
+        Scores how well a hit matches the search term: an exact serial number
+        beats a match at the start of a word in the option text, which beats
+        any other match.
+        """
+        serial_number = normalize_identifier(hit.serial_number)
+        if serial_number and serial_number == normalize_identifier(query):
+            return 3
+
+        text = hit.option.get("text", "").casefold()
+        if re.search(rf"(?<!\w){re.escape(query)}", text):
+            return 2
+        if hit.matches(query):
+            return 1
+        return 0
+
+    def _spatial_search(self, providers: list[Provider], query: SpatialQuery, max_results: int) -> list[SearchHit]:
+        """
+        Answers a `bbox:` or `near:` search from the providers supporting
+        spatial searches. Results of `near:` searches are ordered by their
+        distance, those of `bbox:` searches by provider.
+        """
+        results = self._collect_hits(
+            [(provider, provider.spatial_hits, (query,)) for provider in providers if hasattr(provider, "spatial_hits")]
+        )
+        hits = [hit for provider_hits in results for hit in provider_hits]
+        if query.kind == "near":
+            hits.sort(key=lambda hit: hit.distance_km if hit.distance_km is not None else float("inf"))
+        return hits[:max_results] if max_results else hits
+
+    def _classify_query(self, providers: list[Provider], search: str) -> list[QueryRoute]:
+        """
+        Classifies the search term with the `lookup_patterns` of every provider.
+
+        Returns one route per provider with a pattern fully matching the search
+        term. If no pattern matches, the list is empty and the search term is
+        sent to all providers as usual.
+        """
+        query = search.strip()
+        routes = []
+        for provider in providers:
+            for kind, pattern in (getattr(provider, "lookup_patterns", None) or {}).items():
+                try:
+                    matched = re.fullmatch(pattern, query) is not None
+                except re.error as e:
+                    logger.error("Invalid lookup pattern %r for %s: %s", pattern, repr(provider), e)
+                    continue
+                if matched:
+                    routes.append(QueryRoute(provider=provider, kind=kind))
+                    break
+
+        if routes:
+            logger.debug(
+                "%s routes %r to direct lookups: %s",
+                type(self).__name__,
+                query,
+                [(repr(route.provider), route.kind) for route in routes],
+            )
+        return routes
+
+    def _search_provider(
+        self,
+        provider,
+        project,
+        search: str,
+        user=None,
+        site=None,
+        refinement_cache_timeout: int = REFINEMENT_CACHE_TIMEOUT,
+    ) -> list[SearchHit]:
+        """
+        Searches one provider, reusing the previous complete result set of the
+        same session if the search term extends its search term.
+
+        A result set is complete if it has fewer hits than the provider's
+        `max_hits`. Every result for a longer search term is then a subset of
+        it and can be filtered locally instead of querying the backend again.
+        Only providers with `supports_local_refinement` are refined, the
+        others search fields the hits do not contain, and only if the
+        provider's `can_refine` accepts the longer search term.
+        """
+        refinable = refinement_cache_timeout and getattr(provider, "supports_local_refinement", False)
+        cache_key = self._refinement_cache_key(provider, project, user) if refinable else None
+        normalized_search = search.strip().casefold()
+
+        if cache_key is not None:
+            cached = get_cache().get(cache_key)
+            if cached is not None and provider.can_refine(cached["search"], normalized_search):
+                hits = [hit for hit in cached["hits"] if hit.matches(normalized_search)]
+                logger.debug(
+                    "%s refined %s cached hit(s) for %r locally to %s hit(s) for %r",
+                    repr(provider),
+                    len(cached["hits"]),
+                    cached["search"],
+                    len(hits),
+                    search,
+                )
+                return hits
+
+        hits = provider.search_hits(project, search, user, site)
+        if hits is None:
+            # a failed request is no complete result set and is not kept
+            return []
+
+        if cache_key is not None and len(hits) < provider.max_hits:
+            get_cache().set(cache_key, {"search": normalized_search, "hits": hits}, refinement_cache_timeout)
+
+        return hits
+
+    def _refinement_cache_key(self, provider, project, user) -> str | None:
+        user_id = getattr(user, "pk", None)
+        if user_id is None:
+            return None
+        return make_cache_key("refinement", self.config_key, user_id, getattr(project, "pk", None), provider.cache_key)
+
+    def _record_search_results(self, project, search: str, results: list[dict]) -> None:
+        # the search term is only counted if one of its options is selected
+        record_search_results(self.config_key, getattr(project, "pk", None), search.strip(), [option["id"] for option in results])
+
+    def _prefetch_details(self, project, user, results: list[dict], section_config: dict) -> None:
+        """
+        Starts fetching the handler details of the first `prefetch_details`
+        options in the background, so that selecting one of them is answered
+        from the response cache.
+        """
+        prefetch_count = section_config.get("prefetch_details", 0)
+        user_id = getattr(user, "pk", None)
+        if not prefetch_count or user_id is None or project is None or project.catalog is None:
+            return
+
+        external_ids = [option["id"] for option in results[:prefetch_count]]
+        prefetch_details(project.catalog.uri, external_ids, user_id, section_config.get("prefetch_budget", PREFETCH_BUDGET))
+
     def _filter_providers_for_project(self, project, providers: list[Provider]) -> list[Provider]:
         if self.config_key != SENSORSPROVIDER_CONFIG_KEY or project is None:
             return providers
@@ -103,6 +433,13 @@ class BaseMetaProvider(Provider):
         return filtered
 
     def _allowed_sms_prefixes(self, project) -> set[str]:
+        # the version is read before the values, so that prefixes read before
+        # a concurrent invalidation are cached under the outdated version
+        cache_key = allowed_sms_prefixes_cache_key(project.pk)
+        prefixes = get_cache().get(cache_key)
+        if prefixes is not None:
+            return set(prefixes)
+
         prefixes: set[str] = set()
         values = (
             Value.objects.filter(project=project, attribute__uri=CONFIGURATION_SEARCH_ATTRIBUTE_URI)
@@ -117,9 +454,21 @@ class BaseMetaProvider(Provider):
             cfg_prefix = external_id.split(":", 1)[0]
             if cfg_prefix.endswith("cfg"):
                 prefixes.add(f"{cfg_prefix[:-3]}sms")
+
+        # version bumps only reach the other workers through a shared cache
+        get_cache().set(cache_key, sorted(prefixes), get_invalidated_timeout(ALLOWED_SMS_PREFIXES_CACHE_TIMEOUT))
         return prefixes
 
 
+def allowed_sms_prefixes_cache_key(project_id) -> str:
+    version = get_version(ALLOWED_SMS_PREFIXES_NAMESPACE, project_id)
+    return make_cache_key(ALLOWED_SMS_PREFIXES_NAMESPACE, project_id, version)
+
+
+def invalidate_allowed_sms_prefixes(project_id) -> None:
+    bump_version(ALLOWED_SMS_PREFIXES_NAMESPACE, project_id)
+
+
 class SensorsProvider(BaseMetaProvider):
     """
     A meta-provider for searching sensor data across multiple sources.
@@ -134,3 +483,10 @@ class ConfigurationsProvider(BaseMetaProvider):
     """
 
     config_key = CONFIGURATIONSPROVIDER_CONFIG_KEY
+
+
+# meta-providers by their configuration section
+META_PROVIDERS = {
+    SENSORSPROVIDER_CONFIG_KEY: SensorsProvider,
+    CONFIGURATIONSPROVIDER_CONFIG_KEY: ConfigurationsProvider,
+}
@@ -1,7 +1,8 @@
 import logging
+from urllib.parse import quote
 
-from rdmo_sensorsearch.client import fetch_json
-from rdmo_sensorsearch.providers.base import BaseSensorProvider
+from rdmo_sensorsearch.client import fetch_cached_json
+from rdmo_sensorsearch.providers.base import BaseSensorProvider, SearchHit
 
 logger = logging.getLogger(__name__)
 
@@ -35,11 +36,15 @@ class GeophysicalInstrumentPoolPotsdamProvider(BaseSensorProvider):
     text_prefix = "GIPP:"
     base_url = "https://gipp.gfz-potsdam.de/instruments"
     instruments_url = "{base_url}/index.json?limit=10000&program=MOSES"
+    lookup_urls = {"id": "{base_url}/rest/{identifier}.json"}
 
     option_id = "{prefix}:{id}"
     option_text = "{prefix} {code}"
 
-    def get_options(self, project, search=None, user=None, site=None):
+    # the instrument list is searched locally, the haystack holds every field
+    supports_local_refinement = True
+
+    def search_hits(self, project, search=None, user=None, site=None) -> list[SearchHit] | None:
         """
         Searches the GIPP instrument list for instruments matching the provided
         search term.
@@ -57,27 +62,51 @@ class GeophysicalInstrumentPoolPotsdamProvider(BaseSensorProvider):
                                     implementation.
 
         Returns:
-            list: A list of option dictionaries containing "id" and "text".
+            list | None: A list of SearchHit objects with option dictionaries
+                         containing "id" and "text", or None if the request
+                         failed.
         """
         if not search:
             return []
 
         url = self.instruments_url.format(base_url=self.base_url)
-        instruments = fetch_json(url)
+        instruments = fetch_cached_json(url)
+        if isinstance(instruments, dict) and "errors" in instruments:
+            logger.debug("GIPP instrument list could not be fetched: %s", instruments["errors"])
+            return None
 
         if not instruments:
             logger.debug("No instruments found for query '%s'", search)
             return []
 
-        optionset = []
+        hits = []
         for instrument in instruments:
             option = self.extract_option_for_instrument(instrument, search)
             if option:
-                optionset.append(option)
-            if len(optionset) >= self.max_hits:
+                hits.append(self._instrument_hit(option, instrument))
+            if len(hits) >= self.max_hits:
                 break
 
-        return optionset
+        return hits
+
+    def lookup_hits(self, kind: str, identifier: str) -> list[SearchHit] | None:
+        url_template = self.lookup_urls.get(kind)
+        if url_template is None:
+            return None
+
+        instrument = fetch_cached_json(url_template.format(base_url=self.base_url, identifier=quote(identifier)))
+        if not isinstance(instrument, dict) or not isinstance(instrument.get("Instrument"), dict):
+            logger.debug("No GIPP %s lookup result for %s", kind, identifier)
+            return []
+
+        inst_data = instrument["Instrument"]
+        if "id" not in inst_data or "code" not in inst_data:
+            return []
+        option = {
+            "id": self.option_id.format(prefix=self.id_prefix, id=inst_data["id"]),
+            "text": self.option_text.format(prefix=self.text_prefix, code=inst_data["code"]),
+        }
+        return [self._instrument_hit(option, instrument)]
 
     def extract_option_for_instrument(self, instrument: dict, search: str) -> dict | None:
         try:
@@ -96,3 +125,15 @@ class GeophysicalInstrumentPoolPotsdamProvider(BaseSensorProvider):
             logger.debug("Skipping malformed instrument entry: %s", e)
 
         return None
+
+    def _instrument_hit(self, option: dict, instrument: dict) -> SearchHit:
+        category = instrument.get("Instrumentcategory")
+        return SearchHit(
+            option=option,
+            haystack=self._instrument_haystack(instrument),
+            serial_number=instrument["Instrument"].get("serialNo"),
+            manufacturer=category.get("manufacturer") if isinstance(category, dict) else None,
+        )
+
+    def _instrument_haystack(self, instrument: dict) -> str:
+        return " ".join(str(value) for value in instrument["Instrument"].values())
@@ -0,0 +1,136 @@
+import logging
+import os
+import threading
+
+from rdmo_sensorsearch.providers.base import BaseSensorProvider, SearchHit, normalize_identifier
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLUMNS = ["option_id", "name", "serial_number", "manufacturer", "model", "name_key", "serial_key", "haystack"]
+
+
+class HarvestSnapshotProvider(BaseSensorProvider):
+    """
+    Searches a columnar snapshot of a harvested catalogue (see
+    `sensorsearch_snapshot`) instead of a live registry API.
+
+    The snapshot is memory-mapped and searched with Arrow compute kernels:
+    an exact serial number match ranks first, then names starting with the
+    search term, then any substring match in name, serial number,
+    manufacturer or model. The snapshot file is reloaded when it changes.
+
+    Attributes:
+        id_prefix (str):    Prefix for generated option IDs, usually the
+                            id_prefix of the harvested backend, so that its
+                            handler resolves the selected options.
+        text_prefix (str):  Prefix for displayed option text.
+        max_hits (int):     Maximum number of search results to return.
+                            Defaults to 10.
+        path (str):         Path of the .parquet or .arrow snapshot file.
+    """
+
+    text_prefix = "Snapshot:"
+    lookup_fields = {"id": "option_id", "serial": "serial_key"}
+
+    option_id = "{id_prefix}:{id}"
+    option_text = "{prefix} {name}{serial}"
+
+    path: str | None = None
+    # the haystack and serial number are the searched columns
+    supports_local_refinement = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._table = None
+        self._table_mtime_ns = None
+        self._table_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        if self.path is None:
+            raise NotImplementedError(f"{type(self).__name__} must define `path`")
+        return str(self.path)
+
+    def search_hits(self, project, search=None, user=None, site=None) -> list[SearchHit]:
+        table = self._load_table()
+        if not search or table is None:
+            return []
+
+        query = search.strip().casefold()
+        serial_key = normalize_identifier(search)
+
+        masks = []
+        if serial_key:
+            masks.append(pc.equal(table["serial_key"], serial_key))
+        masks.append(pc.starts_with(table["name_key"], query))
+        masks.append(pc.match_substring(table["haystack"], query))
+
+        hits: list[SearchHit] = []
+        seen: set[str] = set()
+        for mask in masks:
+            for row in table.filter(mask).slice(0, self.max_hits).to_pylist():
+                if row["option_id"] in seen:
+                    continue
+                seen.add(row["option_id"])
+                hits.append(self._row_hit(row))
+            if len(hits) >= self.max_hits:
+                break
+
+        return hits[: self.max_hits]
+
+    def lookup_hits(self, kind: str, identifier: str) -> list[SearchHit] | None:
+        column = self.lookup_fields.get(kind)
+        if column is None:
+            return None
+
+        table = self._load_table()
+        if table is None:
+            return []
+
+        value = normalize_identifier(identifier) if column == "serial_key" else identifier
+        rows = table.filter(pc.equal(table[column], value)).slice(0, self.max_hits).to_pylist()
+        return [self._row_hit(row) for row in rows]
+
+    def _row_hit(self, row: dict) -> SearchHit:
+        serial = f" (s/n: {row['serial_number']})" if row["serial_number"] else ""
+        return SearchHit(
+            option={
+                "id": self.option_id.format(id_prefix=self.id_prefix, id=row["option_id"]),
+                "text": self.option_text.format(prefix=self.text_prefix, name=row["name"] or row["option_id"], serial=serial),
+            },
+            haystack=row["haystack"],
+            serial_number=row["serial_number"],
+            manufacturer=row["manufacturer"],
+            model=row["model"],
+        )
+
+    def _load_table(self):
+        if pa is None:
+            logger.error("%s requires pyarrow, install rdmo-plugins-sensorsearch[snapshots]", type(self).__name__)
+            return None
+
+        from rdmo_sensorsearch.harvest.columnar import SnapshotError, read_snapshot
+
+        try:
+            mtime_ns = os.stat(self.base_url).st_mtime_ns
+        except OSError as e:
+            logger.error("Cannot access snapshot %s: %s", self.base_url, e)
+            return None
+
+        with self._table_lock:
+            if self._table is None or self._table_mtime_ns != mtime_ns:
+                try:
+                    table = read_snapshot(self.base_url, columns=SEARCH_COLUMNS)
+                except SnapshotError as e:
+                    logger.error("%s", e)
+                    return self._table
+                self._table = table.filter(pc.is_valid(table["option_id"]))
+                self._table_mtime_ns = mtime_ns
+                logger.debug("Loaded %s row(s) from snapshot %s", self._table.num_rows, self.base_url)
+            return self._table
@@ -1,8 +1,8 @@
 import logging
 from urllib.parse import quote
 
-from rdmo_sensorsearch.client import fetch_json
-from rdmo_sensorsearch.providers.base import BaseSensorProvider
+from rdmo_sensorsearch.client import fetch_cached_json
+from rdmo_sensorsearch.providers.base import BaseSensorProvider, SearchHit, group_identifiers, normalize_identifier
 
 logger = logging.getLogger(__name__)
 
@@ -36,9 +36,28 @@ class O2ARegistrySearchProvider(BaseSensorProvider):
     base_url = "https://registry.o2a-data.de/index/rest/search/sensor-v2"
     query_url = "{base_url}?hits={hits}&q={query}"
 
-    def get_options(self, project, search=None, user=None, site=None):
+    # direct lookups use the REST API instead of the search index
+    rest_base_url = "https://registry.o2a-data.de/rest/v2"
+    lookup_urls = {
+        "id": "{rest_base_url}/items/{identifier}",
+        "serial": "{rest_base_url}/items?where={where}&hits={hits}",
+        "unique_id": "{rest_base_url}/items?where={where}&hits={hits}",
+    }
+    lookup_fields = {"serial": "serialNumber", "unique_id": "uniqueId"}
+    bulk_lookup_url = "{rest_base_url}/items?where={where}&hits={hits}"
+    bulk_lookup_fields = {"id": "id", "serial": "serialNumber", "unique_id": "uniqueId"}
+
+    # the index searches all fields of its records, which the hits keep in
+    # their haystack
+    supports_local_refinement = True
+
+    def can_refine(self, previous_search: str, search: str) -> bool:
+        # the words of the query are alternatives, another word adds results
+        return super().can_refine(previous_search, search) and len(search.split()) <= 1
+
+    def search_hits(self, project, search=None, user=None, site=None) -> list[SearchHit] | None:
         """
-        Retrieves options based on the provided search term.
+        Retrieves search hits based on the provided search term.
 
         Args:
             project (Project):      The RDMO project object.
@@ -50,26 +69,86 @@ class O2ARegistrySearchProvider(BaseSensorProvider):
                                     implementation.
 
         Returns:
-            list: A list of option dictionaries containing "id" and "text".
+            list | None: A list of SearchHit objects with option dictionaries
+                         containing "id" and "text", or None if the request
+                         failed.
         """
         if search is None:
             return []
 
-        optionset: list[dict[str, str]] = []
+        hits: list[SearchHit] = []
 
         # keep alphanumerics(and Unicode characters) and spaces
         search = "".join(c for c in search if c.isalnum() or c.isspace())
 
         query = f"(title:({search}*)^2 OR id:(/{search}/)^20 OR ({search}*)^0) AND (states.itemState:(public devicestore)^0)"
         url = f"{self.base_url}?hits={self.max_hits}&q={quote(query)}"
-        json_data = fetch_json(url)
+        json_data = fetch_cached_json(url)
+        if "errors" in json_data:
+            logger.debug("O2A REGISTRY search for %s failed: %s", search, json_data["errors"])
+            return None
 
         for record in json_data.get("records", []):
-            optionset.append(self.parse_option(record))
-            if len(optionset) >= self.max_hits:
+            metadata = record.get("metadata") or {}
+            hits.append(
+                SearchHit(
+                    option=self.parse_option(record),
+                    haystack=self._record_haystack(record),
+                    serial_number=metadata.get("serial"),
+                    manufacturer=metadata.get("manufacturer"),
+                    model=metadata.get("model"),
+                )
+            )
+            if len(hits) >= self.max_hits:
                 break
 
-        return optionset
+        return hits
+
+    def lookup_hits(self, kind: str, identifier: str) -> list[SearchHit] | None:
+        url_template = self.lookup_urls.get(kind)
+        if url_template is None:
+            return None
+
+        value = identifier.replace('"', '\\"')
+        url = url_template.format(
+            rest_base_url=self.rest_base_url,
+            identifier=quote(identifier),
+            where=quote(f'{self.lookup_fields.get(kind)}=="{value}"', safe='="'),
+            hits=self.max_hits,
+        )
+        json_data = fetch_cached_json(url)
+        if not isinstance(json_data, dict) or "errors" in json_data:
+            logger.debug("No O2A REGISTRY %s lookup result for %s", kind, identifier)
+            return []
+
+        items = json_data.get("records", []) if "records" in json_data else [json_data]
+        return [self._item_hit(item) for item in items[: self.max_hits] if item.get("id") is not None]
+
+    def bulk_lookup_hits(self, kind: str, identifiers: list[str]) -> dict[str, list[SearchHit]] | None:
+        field_name = self.bulk_lookup_fields.get(kind)
+        if field_name is None:
+            return super().bulk_lookup_hits(kind, identifiers)
+
+        values = ",".join('"{}"'.format(identifier.replace('"', '\\"')) for identifier in identifiers)
+        url = self.bulk_lookup_url.format(
+            rest_base_url=self.rest_base_url,
+            where=quote(f"{field_name}=in=({values})", safe='=",()'),
+            hits=len(identifiers) * self.max_hits,
+        )
+        json_data = fetch_cached_json(url)
+        if not isinstance(json_data, dict) or "errors" in json_data:
+            logger.debug("O2A REGISTRY bulk %s lookup failed, looking up one by one", kind)
+            return super().bulk_lookup_hits(kind, identifiers)
+
+        results = {identifier: [] for identifier in identifiers}
+        by_key = group_identifiers(identifiers)
+        for item in json_data.get("records", []):
+            if item.get("id") is None:
+                continue
+            for identifier in by_key.get(normalize_identifier(item.get(field_name)), []):
+                if len(results[identifier]) < self.max_hits:
+                    results[identifier].append(self._item_hit(item))
+        return results
 
     def parse_option(self, data_set: dict) -> dict[str, str]:
         """
@@ -92,3 +171,44 @@ class O2ARegistrySearchProvider(BaseSensorProvider):
             text = f"{self.text_prefix} {title} (id: {registry_id})"
 
         return {"id": f"{self.id_prefix}:{unique_id}", "text": text}
+
+    def _record_haystack(self, data_set) -> str:
+        if isinstance(data_set, dict):
+            return " ".join(self._record_haystack(value) for value in data_set.values())
+        if isinstance(data_set, list):
+            return " ".join(self._record_haystack(value) for value in data_set)
+        return "" if data_set is None else str(data_set)
+
+    def parse_item_option(self, item: dict) -> dict[str, str]:
+        """
+        Converts a single item of the REST API to an option dictionary.
+
+        Args:
+            item (dict): The JSON dictionary for a single item.
+
+        Returns:
+            dict: An option dictionary with "id" and "text" keys.
+        """
+        title = item.get("longName") or item.get("shortName") or item.get("code") or ""
+        serial = item.get("serialNumber")
+        registry_id = item["id"]
+        unique_id = item.get("uniqueId") or registry_id
+
+        if serial:
+            text = f"{self.text_prefix} {title} (s/n: {serial}, id: {registry_id})"
+        else:
+            text = f"{self.text_prefix} {title} (id: {registry_id})"
+
+        return {"id": f"{self.id_prefix}:{unique_id}", "text": text}
+
+    def _item_hit(self, item: dict) -> SearchHit:
+        return SearchHit(
+            option=self.parse_item_option(item),
+            haystack=self._item_haystack(item),
+            serial_number=item.get("serialNumber"),
+            manufacturer=item.get("manufacturer"),
+            model=item.get("model"),
+        )
+
+    def _item_haystack(self, item: dict) -> str:
+        return " ".join(str(item.get(key) or "") for key in ("shortName", "longName", "serialNumber", "uniqueId", "id"))
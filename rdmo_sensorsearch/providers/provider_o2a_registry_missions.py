@@ -2,8 +2,8 @@ import logging
 from collections import defaultdict
 from urllib.parse import quote
 
-from rdmo_sensorsearch.client import fetch_json
-from rdmo_sensorsearch.providers.base import BaseSensorProvider
+from rdmo_sensorsearch.client import fetch_cached_json
+from rdmo_sensorsearch.providers.base import BaseSensorProvider, SearchHit
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +18,14 @@ class O2ARegistryMissionsProvider(BaseSensorProvider):
     base_url = "https://registry.o2a-data.de/rest/v2/missions"
 
     query_url = "{base_url}?where={where}&sorts={sorts}&offset={offset}&hits={hits}"
+    lookup_urls = {"id": "{base_url}/{identifier}"}
     where_template = 'name=ILIKE="*{query}*"'
     sorts = ""
     offset = 0
     option_id = "{id_prefix}:{id}"
     option_text = "{prefix}({id}): {name}"
 
-    def get_options(self, project, search=None, user=None, site=None):
+    def search_hits(self, project, search=None, user=None, site=None) -> list[SearchHit] | None:
         if search is None:
             return []
 
@@ -41,21 +42,37 @@ class O2ARegistryMissionsProvider(BaseSensorProvider):
             hits=self.max_hits,
             query=quote(query),
         )
-        json_data = fetch_json(url)
+        json_data = fetch_cached_json(url)
+        if isinstance(json_data, dict) and "errors" in json_data:
+            logger.debug("O2A missions search for %s failed: %s", search, json_data["errors"])
+            return None
 
         records = json_data.get("records", []) if isinstance(json_data, dict) else []
         if not records:
             logger.debug("Empty response from O2A missions API for %s", search)
             return []
 
-        return [
-            {
+        return [self._mission_hit(mission) for mission in records[: self.max_hits] if mission.get("id") is not None]
+
+    def lookup_hits(self, kind: str, identifier: str) -> list[SearchHit] | None:
+        url_template = self.lookup_urls.get(kind)
+        if url_template is None:
+            return None
+
+        mission = fetch_cached_json(url_template.format(base_url=self.base_url, identifier=quote(identifier)))
+        if not isinstance(mission, dict) or "errors" in mission or mission.get("id") is None:
+            logger.debug("No O2A mission %s lookup result for %s", kind, identifier)
+            return []
+        return [self._mission_hit(mission)]
+
+    def _mission_hit(self, mission: dict) -> SearchHit:
+        return SearchHit(
+            option={
                 "id": self.option_id.format(id_prefix=self.id_prefix, id=mission.get("id", "")),
                 "text": self._format_mission_text(mission),
-            }
-            for mission in records[: self.max_hits]
-            if mission.get("id") is not None
-        ]
+            },
+            haystack=mission.get("name") or "",
+        )
 
     def _sanitize_query(self, search: str) -> str:
         return search.replace("\\", "\\\\").replace('"', '\\"').strip()
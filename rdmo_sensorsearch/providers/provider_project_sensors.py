@@ -1,13 +1,16 @@
 import logging
 
-from rdmo.domain.models import Attribute
 from rdmo.options.providers import Provider
 from rdmo.projects.models import Value
 
-from rdmo_sensorsearch.config import load_config
+from rdmo_sensorsearch.cache import bump_version, get_cache, get_invalidated_timeout, get_version, make_cache_key
+from rdmo_sensorsearch.snapshot import get_config_snapshot
 
 logger = logging.getLogger(__name__)
 
+PROJECT_VALUES_VERSION_NAMESPACE = "project-values"
+PROJECT_OPTIONS_CACHE_TIMEOUT = 24 * 60 * 60
+
 
 class BaseProjectAttributeOptionsProvider(Provider):
     """
@@ -31,41 +34,43 @@ class BaseProjectAttributeOptionsProvider(Provider):
             logger.debug("No source attribute configured for catalog %s", project.catalog.uri)
             return []
 
-        try:
-            attribute = Attribute.objects.get(uri=source_attribute_uri)
-        except Attribute.DoesNotExist:
-            logger.warning("Configured project sensor source attribute does not exist: %s", source_attribute_uri)
-            return []
+        cache_key = make_cache_key(
+            "project-options",
+            project.pk,
+            source_attribute_uri,
+            get_version(PROJECT_VALUES_VERSION_NAMESPACE, project.pk),
+        )
+        options = get_cache().get(cache_key)
+        if options is None:
+            options = self._build_options(project, source_attribute_uri)
+            # version bumps only reach the other workers through a shared cache
+            get_cache().set(cache_key, options, get_invalidated_timeout(PROJECT_OPTIONS_CACHE_TIMEOUT))
+        return options
 
+    def _build_options(self, project, source_attribute_uri: str) -> list[dict]:
         values = (
-            Value.objects.filter(project=project, attribute=attribute)
+            Value.objects.filter(project=project, attribute__uri=source_attribute_uri)
             .filter(snapshot=None)
             .exclude(text__isnull=True)
             .exclude(text__exact="")
             .order_by("set_prefix", "set_index", "collection_index", "id")
+            .values_list("external_id", "text")
         )
 
         seen = set()
         options = []
-        for value in values:
-            option_id = value.external_id or value.text
+        for external_id, text in values:
+            option_id = external_id or text
             if option_id in seen:
                 continue
 
             seen.add(option_id)
-            options.append({"id": option_id, "text": value.text})
+            options.append({"id": option_id, "text": text})
 
         return options
 
     def _get_source_attribute_uri(self, catalog_uri: str) -> str | None:
-        configuration = load_config()
-        catalogs = configuration.get(self.config_key, {}).get("catalogs", [])
-
-        for catalog in catalogs:
-            if catalog.get("catalog_uri") == catalog_uri:
-                return catalog.get("source_attribute_uri")
-
-        return None
+        return get_config_snapshot().get_source_attribute_uri(self.config_key, catalog_uri)
 
 
 class ProjectConfigurationSensorsProvider(BaseProjectAttributeOptionsProvider):
@@ -82,3 +87,10 @@ class ProjectDataCollectionDevicesProvider(BaseProjectAttributeOptionsProvider):
     """
 
     config_key = "ProjectDataCollectionDevicesProvider"
+
+
+def bump_project_values_version(project_id) -> None:
+    """
+    Invalidates the cached project-local options of a project.
+    """
+    bump_version(PROJECT_VALUES_VERSION_NAMESPACE, project_id)
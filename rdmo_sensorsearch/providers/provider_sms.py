@@ -1,8 +1,9 @@
+import json
 import logging
 from urllib.parse import quote
 
-from rdmo_sensorsearch.client import fetch_json
-from rdmo_sensorsearch.providers.base import BaseSensorProvider
+from rdmo_sensorsearch.client import fetch_cached_json
+from rdmo_sensorsearch.providers.base import BaseSensorProvider, SearchHit, group_identifiers, normalize_identifier
 
 logger = logging.getLogger(__name__)
 
@@ -35,14 +36,41 @@ class SensorManagementSystemProvider(BaseSensorProvider):
     # base_url is set by config
     # max_hits = 10 from base provider
 
-    query_url = "{base_url}?q={query}"
+    # Only the page shown as options and only the attributes used for the
+    # option text and searched by `q` are requested, so that single-word
+    # searches can be refined locally.
+    query_url = "{base_url}?q={query}&page[size]={page_size}&fields[device]={fields}"
+    lookup_urls = {
+        "id": "{base_url}/{identifier}?fields[device]={fields}",
+        "serial": "{base_url}?filter={filter}&page[size]={page_size}&fields[device]={fields}",
+    }
+    bulk_lookup_url = "{base_url}?filter={filter}&page[size]={page_size}&fields[device]={fields}"
+    bulk_lookup_filter_names = {"id": "id", "serial": "serial_number"}
+    sparse_fields = (
+        "short_name",
+        "long_name",
+        "serial_number",
+        "inventory_number",
+        "manufacturer_name",
+        "model",
+        "device_type_name",
+        "status_name",
+        "persistent_identifier",
+        "description",
+    )
+    haystack_fields = sparse_fields
+    supports_local_refinement = True
 
     option_id = "{id_prefix}:{id}"
     option_text = "{prefix}({id}): {name}{serial}"
 
-    def get_options(self, project, search=None, user=None, site=None):
+    def can_refine(self, previous_search: str, search: str) -> bool:
+        # `q` matches the words separately, another word can add results
+        return super().can_refine(previous_search, search) and len(search.split()) <= 1
+
+    def search_hits(self, project, search=None, user=None, site=None) -> list[SearchHit] | None:
         """
-        Retrieves options based on the provided search term from the SMS.
+        Retrieves search hits based on the provided search term from the SMS.
 
         Args:
             project (Project):      The RDMO project object.
@@ -54,33 +82,98 @@ class SensorManagementSystemProvider(BaseSensorProvider):
                                     implementation.
 
         Returns:
-            list: A list of option dictionaries containing "id" and "text".
+            list | None: A list of SearchHit objects with option dictionaries
+                         containing "id" and "text", or None if the request
+                         failed.
         """
 
         if search is None:
             return []
 
         query = quote(search)
-        url = self.query_url.format(base_url=self.base_url, query=query)
-        json_fetched = fetch_json(url)
+        url = self.query_url.format(
+            base_url=self.base_url,
+            query=query,
+            page_size=self.max_hits,
+            fields=",".join(self.sparse_fields),
+        )
+        json_fetched = fetch_cached_json(url)
+        if "errors" in json_fetched:
+            logger.debug("SMS search for %s failed: %s", search, json_fetched["errors"])
+            return None
 
         json_data = json_fetched.get("data", [])
         if not json_data:
             logger.debug(f"Empty response from SMS API for {search}")
             return []
 
-        optionset = []
+        return [self._sensor_hit(sensor) for sensor in json_data[: self.max_hits]]
+
+    def lookup_hits(self, kind: str, identifier: str) -> list[SearchHit] | None:
+        url_template = self.lookup_urls.get(kind)
+        if url_template is None:
+            return None
+
+        serial_filter = [{"name": "serial_number", "op": "eq", "val": identifier}]
+        url = url_template.format(
+            base_url=self.base_url,
+            identifier=quote(identifier),
+            filter=quote(json.dumps(serial_filter, separators=(",", ":"))),
+            page_size=self.max_hits,
+            fields=",".join(self.sparse_fields),
+        )
+        json_fetched = fetch_cached_json(url)
+        if "errors" in json_fetched:
+            logger.debug("No SMS %s lookup result for %s", kind, identifier)
+            return []
 
-        for sensor in json_data[: self.max_hits]:
-            optionset.append(
-                {
-                    "id": self.option_id.format(id_prefix=self.id_prefix, id=sensor["id"]),
-                    "text": self._format_sensor_text(sensor["id"], sensor["attributes"]),
-                }
-            )
-        return optionset
+        json_data = json_fetched.get("data") or []
+        if isinstance(json_data, dict):
+            json_data = [json_data]
+        return [self._sensor_hit(sensor) for sensor in json_data[: self.max_hits]]
+
+    def bulk_lookup_hits(self, kind: str, identifiers: list[str]) -> dict[str, list[SearchHit]] | None:
+        filter_name = self.bulk_lookup_filter_names.get(kind)
+        if filter_name is None:
+            return super().bulk_lookup_hits(kind, identifiers)
+
+        identifier_filter = [{"name": filter_name, "op": "in_", "val": list(identifiers)}]
+        url = self.bulk_lookup_url.format(
+            base_url=self.base_url,
+            filter=quote(json.dumps(identifier_filter, separators=(",", ":"))),
+            page_size=len(identifiers) * self.max_hits,
+            fields=",".join(self.sparse_fields),
+        )
+        json_fetched = fetch_cached_json(url)
+        if "errors" in json_fetched:
+            logger.debug("SMS bulk %s lookup failed, looking up one by one", kind)
+            return super().bulk_lookup_hits(kind, identifiers)
+
+        results = {identifier: [] for identifier in identifiers}
+        by_key = group_identifiers(identifiers)
+        for sensor in json_fetched.get("data") or []:
+            key = sensor["id"] if kind == "id" else sensor["attributes"].get("serial_number")
+            for identifier in by_key.get(normalize_identifier(key), []):
+                if len(results[identifier]) < self.max_hits:
+                    results[identifier].append(self._sensor_hit(sensor))
+        return results
+
+    def _sensor_hit(self, sensor: dict) -> SearchHit:
+        return SearchHit(
+            option={
+                "id": self.option_id.format(id_prefix=self.id_prefix, id=sensor["id"]),
+                "text": self._format_sensor_text(sensor["id"], sensor["attributes"]),
+            },
+            haystack=self._sensor_haystack(sensor["attributes"]),
+            serial_number=sensor["attributes"].get("serial_number"),
+            manufacturer=sensor["attributes"].get("manufacturer_name"),
+            model=sensor["attributes"].get("model"),
+        )
 
     def _format_sensor_text(self, sensor_id: str, attrs: dict) -> str:
         name = attrs.get("long_name") or attrs.get("short_name", "")
         serial = f" (s/n: {attrs['serial_number']})" if attrs.get("serial_number") else ""
         return self.option_text.format(prefix=self.text_prefix, id=sensor_id, name=name, serial=serial)
+
+    def _sensor_haystack(self, attrs: dict) -> str:
+        return " ".join(str(attrs.get(key) or "") for key in self.haystack_fields)
@@ -1,8 +1,10 @@
 import logging
 from urllib.parse import quote
 
-from rdmo_sensorsearch.client import fetch_json
-from rdmo_sensorsearch.providers.base import BaseSensorProvider
+from rdmo_sensorsearch.client import fetch_cached_json
+from rdmo_sensorsearch.harvest.location_index import get_configuration_location_index
+from rdmo_sensorsearch.providers.base import BaseSensorProvider, SearchHit
+from rdmo_sensorsearch.spatial import SpatialQuery
 
 logger = logging.getLogger(__name__)
 
@@ -13,39 +15,100 @@ class SensorManagementSystemConfigurationsProvider(BaseSensorProvider):
 
     The SMS API exposes configurations as first-class resources. This provider
     searches them by label and returns one option per matching configuration.
+
+    Spatial searches (`bbox:` and `near:`) are answered from the location
+    index of the harvested static location actions of the SMS instance, see
+    `harvest.location_index`. The harvest uses the id_prefix of the SMS
+    instance, which is derived from the id_prefix of the provider ("gfzcfg"
+    becomes "gfzsms") unless `harvest_id_prefix` is set.
     """
 
     # Match the SMS frontend configuration search more closely. `q` performs
     # the free-text search; the other flags keep the result set aligned with
-    # the public UI behavior.
+    # the public UI behavior. Only the attributes used for the option text are
+    # requested, so the results are not refined locally.
     query_url = (
-        "{base_url}?page[size]={page_size}&page[number]=1&include=created_by.contact"
+        "{base_url}?page[size]={page_size}&page[number]=1&fields[configuration]={fields}"
         "&filter=[]&q={query}&sort=label&hide_archived=false"
     )
 
+    lookup_urls = {"id": "{base_url}/{identifier}?fields[configuration]={fields}"}
+    sparse_fields = ("label", "project", "persistent_identifier")
+
     option_id = "{id_prefix}:{id}"
     option_text = "{prefix}({id}): {label}{project}{pid}"
+    distance_text = " ({distance_km:.1f} km)"
 
-    def get_options(self, project, search=None, user=None, site=None):
+    harvest_id_prefix: str | None = None
+
+    def search_hits(self, project, search=None, user=None, site=None) -> list[SearchHit] | None:
         if search is None:
             return []
 
         query = quote(search)
-        url = self.query_url.format(base_url=self.base_url, query=query, page_size=self.max_hits)
-        json_fetched = fetch_json(url)
+        url = self.query_url.format(
+            base_url=self.base_url,
+            query=query,
+            page_size=self.max_hits,
+            fields=",".join(self.sparse_fields),
+        )
+        json_fetched = fetch_cached_json(url)
+        if "errors" in json_fetched:
+            logger.debug("SMS configuration search for %s failed: %s", search, json_fetched["errors"])
+            return None
 
         json_data = json_fetched.get("data", [])
         if not json_data:
             logger.debug("Empty response from SMS configurations API for %s", search)
             return []
 
-        return [
-            {
+        return [self._configuration_hit(configuration) for configuration in json_data[: self.max_hits]]
+
+    def lookup_hits(self, kind: str, identifier: str) -> list[SearchHit] | None:
+        url_template = self.lookup_urls.get(kind)
+        if url_template is None:
+            return None
+
+        url = url_template.format(base_url=self.base_url, identifier=quote(identifier), fields=",".join(self.sparse_fields))
+        json_fetched = fetch_cached_json(url)
+        configuration = json_fetched.get("data") if "errors" not in json_fetched else None
+        if not isinstance(configuration, dict):
+            logger.debug("No SMS configuration %s lookup result for %s", kind, identifier)
+            return []
+        return [self._configuration_hit(configuration)]
+
+    def spatial_hits(self, query: SpatialQuery) -> list[SearchHit] | None:
+        index = get_configuration_location_index(self.location_index_prefix)
+        if index is None:
+            logger.debug("No harvested static locations of %s, spatial search is not available", self.location_index_prefix)
+            return None
+
+        hits = []
+        for location, distance_km in index.search(query, self.max_hits):
+            configuration = index.configuration(location.configuration_id) or {"id": location.configuration_id, "attributes": {}}
+            hit = self._configuration_hit(configuration)
+            if distance_km is not None:
+                hit.option["text"] += self.distance_text.format(distance_km=distance_km)
+                hit.distance_km = distance_km
+            hits.append(hit)
+        return hits
+
+    @property
+    def location_index_prefix(self) -> str:
+        if self.harvest_id_prefix:
+            return self.harvest_id_prefix
+        if self.id_prefix.endswith("cfg"):
+            return f"{self.id_prefix[:-3]}sms"
+        return self.id_prefix
+
+    def _configuration_hit(self, configuration: dict) -> SearchHit:
+        return SearchHit(
+            option={
                 "id": self.option_id.format(id_prefix=self.id_prefix, id=configuration["id"]),
                 "text": self._format_configuration_text(configuration["id"], configuration["attributes"]),
-            }
-            for configuration in json_data[: self.max_hits]
-        ]
+            },
+            haystack=self._configuration_haystack(configuration["attributes"]),
+        )
 
     def _format_configuration_text(self, configuration_id: str, attrs: dict) -> str:
         project = f" [{attrs['project']}]" if attrs.get("project") else ""
@@ -58,3 +121,6 @@ class SensorManagementSystemConfigurationsProvider(BaseSensorProvider):
             project=project,
             pid=pid,
         )
+
+    def _configuration_haystack(self, attrs: dict) -> str:
+        return " ".join(str(attrs.get(key) or "") for key in self.sparse_fields)
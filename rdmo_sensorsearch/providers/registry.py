@@ -1,4 +1,5 @@
 from rdmo_sensorsearch.providers.provider_gfz_gipp import GeophysicalInstrumentPoolPotsdamProvider
+from rdmo_sensorsearch.providers.provider_harvest_snapshot import HarvestSnapshotProvider
 from rdmo_sensorsearch.providers.provider_o2a_registry import O2ARegistrySearchProvider
 from rdmo_sensorsearch.providers.provider_o2a_registry_missions import O2ARegistryMissionsProvider
 from rdmo_sensorsearch.providers.provider_sms import SensorManagementSystemProvider
@@ -13,4 +14,5 @@ PROVIDER_REGISTRY = {
     "SensorManagementSystemProvider": SensorManagementSystemProvider,
     "SensorManagementSystemConfigurationsProvider": SensorManagementSystemConfigurationsProvider,
     "GeophysicalInstrumentPoolPotsdamProvider": GeophysicalInstrumentPoolPotsdamProvider,
+    "HarvestSnapshotProvider": HarvestSnapshotProvider,
 }
@@ -1,3 +1,4 @@
+import contextvars
 import logging
 from collections.abc import Iterable
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -12,7 +13,7 @@ from django.db.models import Q
 
 from rdmo.projects.models import Value
 
-from rdmo_sensorsearch.client import fetch_json
+from rdmo_sensorsearch.handlers.base import sync_memo
 from rdmo_sensorsearch.signals.utils import mute_value_post_save
 from rdmo_sensorsearch.signals.value_updater import (
     _change_label,
@@ -276,9 +277,11 @@ def _fetch_device_detail_payloads(
     max_workers = min(DEVICE_DETAIL_FETCH_WORKERS, len(refresh_plans))
     results: dict[str, DeviceFetchResult] = {}
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    # the workers share one memo, so every document is fetched once per sync
+    with sync_memo(), ThreadPoolExecutor(max_workers=max_workers) as executor:
         future_to_plan = {
             executor.submit(
+                contextvars.copy_context().run,
                 _fetch_device_detail_payload,
                 plan,
                 root_attribute_id,
@@ -641,6 +644,11 @@ def _compact_device_detail_blocks(
             set_prefix=str(temp_index),
         ).update(set_prefix=str(new_index))
 
+    from rdmo_sensorsearch.providers.provider_project_sensors import bump_project_values_version
+
+    # queryset updates send no signals, so the cached project-local options are invalidated here
+    transaction.on_commit(lambda: bump_project_values_version(project.pk))
+
 
 def _collect_attribute_ids(element) -> set[int]:
     attribute_ids: set[int] = set()
@@ -895,7 +903,11 @@ def _resolve_mounting_period_values(
     if not getattr(sensor_candidate.handler, "supports_mount_action_period_lookup", False):
         return None, None
 
-    mount_actions = _fetch_device_mount_actions(sensor_candidate, device_id)
+    get_device_mount_actions = getattr(sensor_candidate.handler, "get_device_mount_actions", None)
+    if get_device_mount_actions is None:
+        return None, None
+
+    mount_actions = get_device_mount_actions(device_id, configuration_id)
     if not mount_actions:
         return None, None
 
@@ -911,8 +923,9 @@ def _resolve_mounting_period_values(
         if config_ref.get("id") != configuration_id:
             continue
 
-        action_device_ref = relationships.get("device", {}).get("data", {})
-        if action_device_ref.get("id") != device_id:
+        # the device linkage is only present if the device was included
+        action_device_ref = relationships.get("device", {}).get("data") or {}
+        if action_device_ref.get("id") not in (None, device_id):
             continue
 
         attrs = item.get("attributes", {})
@@ -934,25 +947,6 @@ def _resolve_mounting_period_values(
     return _format_timepoint(latest_start), _format_timepoint(latest_end)
 
 
-def _fetch_device_mount_actions(sensor_candidate: Any, device_id: str) -> list[dict]:
-    url = (
-        f"{sensor_candidate.handler.base_url}/devices/{device_id}/device-mount-actions"
-        "?page[size]=10000&include=begin_contact,end_contact,parent_platform,parent_device,configuration"
-    )
-    action_data = fetch_json(url)
-    if isinstance(action_data, dict) and "errors" in action_data:
-        logger.warning(
-            "Could not fetch device mount actions for %s: %s",
-            device_id,
-            action_data["errors"],
-        )
-        return []
-    if not isinstance(action_data, dict):
-        return []
-    data = action_data.get("data", [])
-    return data if isinstance(data, list) else []
-
-
 def _parse_timepoint(value: Any) -> datetime | None:
     if not isinstance(value, str) or not value:
         return None
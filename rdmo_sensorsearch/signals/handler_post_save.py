@@ -1,11 +1,11 @@
 import logging
 
 from rdmo_sensorsearch.handlers.base import HandlerResult
-from rdmo_sensorsearch.handlers.factory import WILDCARD_CATALOG_URI, build_handlers_by_catalog
 from rdmo_sensorsearch.handlers.handler_sms import (
     INSTRUMENT_END_ATTRIBUTE_URI,
     INSTRUMENT_START_ATTRIBUTE_URI,
 )
+from rdmo_sensorsearch.popularity import record_selection
 from rdmo_sensorsearch.signals.value_updater import (
     build_clear_payload,
     clear_attribute_values,
@@ -14,27 +14,13 @@ from rdmo_sensorsearch.signals.value_updater import (
     update_values_from_handler_result,
     update_values_from_mapped_data,
 )
+from rdmo_sensorsearch.snapshot import get_config_snapshot
 
 logger = logging.getLogger(__name__)
 
-ALL_HANDLER_MAP = build_handlers_by_catalog()
-
 
 def _get_handler_candidates(catalog_uri: str) -> list:
-    specific_candidates = ALL_HANDLER_MAP.get(catalog_uri, [])
-    wildcard_candidates = ALL_HANDLER_MAP.get(WILDCARD_CATALOG_URI, [])
-
-    seen = {
-        (candidate.id_prefix, candidate.auto_complete_field_uri, type(candidate.handler)) for candidate in specific_candidates
-    }
-
-    merged_candidates = list(specific_candidates)
-    for candidate in wildcard_candidates:
-        key = (candidate.id_prefix, candidate.auto_complete_field_uri, type(candidate.handler))
-        if key not in seen:
-            merged_candidates.append(candidate)
-
-    return merged_candidates
+    return get_config_snapshot().get_handler_candidates(catalog_uri)
 
 
 def _clear_handler_targets(instance, handler) -> None:
@@ -88,7 +74,7 @@ def _update_mapped_data(instance, mapped_data: dict) -> None:
 
 def handle_post_save(instance):
 
-    if not ALL_HANDLER_MAP:
+    if not get_config_snapshot().handlers_by_catalog:
         logger.warning("No handlers found for %s", __name__)
         return
     if getattr(instance, "snapshot_id", None) is not None:
@@ -169,6 +155,8 @@ def handle_post_save(instance):
             else:
                 _update_mapped_data(instance, mapped_data)
 
+            record_selection(catalog_uri, attribute_uri, instance.project_id, instance.external_id)
+
     if not matched:
         logger.warning(
             "No matching handlers found for id_prefix=%s and attribute_uri=%s in catalog=%s",
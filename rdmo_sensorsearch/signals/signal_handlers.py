@@ -6,6 +6,11 @@ from django.dispatch import receiver
 
 from rdmo.projects.models import Value
 
+from rdmo_sensorsearch.providers.meta_provider import (
+    CONFIGURATION_SEARCH_ATTRIBUTE_URI,
+    invalidate_allowed_sms_prefixes,
+)
+from rdmo_sensorsearch.providers.provider_project_sensors import bump_project_values_version
 from rdmo_sensorsearch.signals.data_collection_variable_sync import (
     DATA_COLLECTION_DEVICES_ATTRIBUTE_URI,
     remove_stale_data_collection_variables,
@@ -14,6 +19,7 @@ from rdmo_sensorsearch.signals.data_collection_variable_sync import (
 from rdmo_sensorsearch.signals.device_set_sync import sync_device_detail_blocks_from_values
 from rdmo_sensorsearch.signals.handler_post_save import _get_handler_candidates, handle_post_save
 from rdmo_sensorsearch.signals.utils import _is_muted
+from rdmo_sensorsearch.snapshot import get_config_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -120,3 +126,20 @@ def remove_data_collection_variables_from_deleted_device(sender, instance, **kwa
         return
 
     transaction.on_commit(lambda: remove_stale_data_collection_variables(instance))
+
+
+@receiver(post_save, sender=Value)
+@receiver(post_delete, sender=Value)
+def invalidate_project_caches(sender, instance, **kwargs):
+    # runs even when muted, values written by the plugin itself must invalidate the caches as well
+    if instance is None or _is_snapshot_value(instance) or instance.project_id is None:
+        return
+    if instance.attribute is None:
+        return
+
+    project_id = instance.project_id
+    attribute_uri = instance.attribute.uri
+    if attribute_uri == CONFIGURATION_SEARCH_ATTRIBUTE_URI:
+        transaction.on_commit(lambda: invalidate_allowed_sms_prefixes(project_id))
+    if attribute_uri in get_config_snapshot().source_attribute_uris.values():
+        transaction.on_commit(lambda: bump_project_values_version(project_id))
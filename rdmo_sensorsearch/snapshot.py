@@ -0,0 +1,119 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from rdmo_sensorsearch.config import ConfigFile, load_config_file
+from rdmo_sensorsearch.handlers.factory import WILDCARD_CATALOG_URI, HandlerInstanceData, build_handlers_by_catalog
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    Everything derived from one version of the configuration file.
+
+    A snapshot is built once per configuration file version and never
+    modified afterwards, so it can be shared by all threads. When the file
+    changes, a new snapshot replaces the old one as a whole.
+    """
+
+    digest: str
+    configuration: dict[str, Any]
+    providers: dict[str, list] = field(default_factory=dict)
+    handlers_by_catalog: dict[str, list[HandlerInstanceData]] = field(default_factory=dict)
+    handler_candidates_by_catalog: dict[str, list[HandlerInstanceData]] = field(default_factory=dict)
+    source_attribute_uris: dict[tuple[str, str], str] = field(default_factory=dict)
+
+    def get_providers(self, config_key: str) -> list:
+        return self.providers.get(config_key, [])
+
+    def get_handler_candidates(self, catalog_uri: str) -> list[HandlerInstanceData]:
+        candidates = self.handler_candidates_by_catalog.get(catalog_uri)
+        if candidates is None:
+            candidates = self.handlers_by_catalog.get(WILDCARD_CATALOG_URI, [])
+        return candidates
+
+    def get_source_attribute_uri(self, config_key: str, catalog_uri: str) -> str | None:
+        return self.source_attribute_uris.get((config_key, catalog_uri))
+
+
+_snapshot: ConfigSnapshot | None = None
+_snapshot_lock = threading.Lock()
+
+
+def get_config_snapshot() -> ConfigSnapshot:
+    """
+    Returns the snapshot of the current configuration file, rebuilding it
+    when the file changed since the last call.
+    """
+    global _snapshot
+
+    config_file = load_config_file()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.digest == config_file.digest:
+        return snapshot
+
+    with _snapshot_lock:
+        if _snapshot is None or _snapshot.digest != config_file.digest:
+            logger.info("Building sensor search configuration snapshot from %s", config_file.path)
+            _snapshot = build_config_snapshot(config_file)
+        return _snapshot
+
+
+def build_config_snapshot(config_file: ConfigFile) -> ConfigSnapshot:
+    from rdmo_sensorsearch.providers.factory import build_provider_instances
+
+    configuration = config_file.configuration
+
+    providers = {
+        config_key: build_provider_instances(config_key, configuration)
+        for config_key, section in configuration.items()
+        if isinstance(section, dict) and "providers" in section
+    }
+
+    handlers_by_catalog = build_handlers_by_catalog(configuration)
+    handler_candidates_by_catalog = {
+        catalog_uri: _merge_handler_candidates(
+            handlers_by_catalog.get(catalog_uri, []),
+            handlers_by_catalog.get(WILDCARD_CATALOG_URI, []),
+        )
+        for catalog_uri in handlers_by_catalog
+    }
+
+    source_attribute_uris = {}
+    for config_key, section in configuration.items():
+        if not isinstance(section, dict):
+            continue
+        for catalog in section.get("catalogs", []):
+            catalog_uri = catalog.get("catalog_uri")
+            source_attribute_uri = catalog.get("source_attribute_uri")
+            if catalog_uri and source_attribute_uri:
+                source_attribute_uris.setdefault((config_key, catalog_uri), source_attribute_uri)
+
+    return ConfigSnapshot(
+        digest=config_file.digest,
+        configuration=configuration,
+        providers=providers,
+        handlers_by_catalog=handlers_by_catalog,
+        handler_candidates_by_catalog=handler_candidates_by_catalog,
+        source_attribute_uris=source_attribute_uris,
+    )
+
+
+def _merge_handler_candidates(
+    specific_candidates: list[HandlerInstanceData],
+    wildcard_candidates: list[HandlerInstanceData],
+) -> list[HandlerInstanceData]:
+    seen = {
+        (candidate.id_prefix, candidate.auto_complete_field_uri, type(candidate.handler)) for candidate in specific_candidates
+    }
+
+    merged_candidates = list(specific_candidates)
+    for candidate in wildcard_candidates:
+        key = (candidate.id_prefix, candidate.auto_complete_field_uri, type(candidate.handler))
+        if key not in seen:
+            merged_candidates.append(candidate)
+
+    return merged_candidates
@@ -0,0 +1,180 @@
+import heapq
+import math
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+GRID_CELL_DEGREES = 1.0
+
+_NUMBER = r"[-+]?\d+(?:\.\d*)?|[-+]?\.\d+"
+_SPATIAL_QUERY_PATTERN = re.compile(
+    rf"^(?P<kind>bbox|near)\s*:\s*(?P<numbers>(?:{_NUMBER})(?:\s*,\s*(?:{_NUMBER}))*)$",
+    re.IGNORECASE,
+)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SpatialQuery:
+    """
+    A map-based search, given as search term in one of the forms
+
+    - ``bbox:south,west,north,east`` for everything inside a bounding box,
+      a box with west > east crosses the antimeridian,
+    - ``near:lat,lon`` for the nearest locations and
+    - ``near:lat,lon,radius_km`` for the nearest locations within a radius.
+    """
+
+    kind: str
+    south: float | None = None
+    west: float | None = None
+    north: float | None = None
+    east: float | None = None
+    latitude: float | None = None
+    longitude: float | None = None
+    radius_km: float | None = None
+
+
+def parse_spatial_query(search: str | None) -> SpatialQuery | None:
+    """
+    Returns the spatial query of a search term, or None if the search term
+    is no (valid) spatial query and should be searched as text.
+    """
+    match = _SPATIAL_QUERY_PATTERN.match((search or "").strip())
+    if match is None:
+        return None
+
+    kind = match.group("kind").casefold()
+    numbers = [float(number) for number in match.group("numbers").split(",")]
+    if kind == "bbox":
+        if len(numbers) != 4:
+            return None
+        south, west, north, east = numbers
+        if not (_is_latitude(south) and _is_latitude(north) and _is_longitude(west) and _is_longitude(east)) or south > north:
+            return None
+        return SpatialQuery(kind=kind, south=south, west=west, north=north, east=east)
+
+    if len(numbers) not in (2, 3):
+        return None
+    latitude, longitude = numbers[:2]
+    radius_km = numbers[2] if len(numbers) == 3 else None
+    if not (_is_latitude(latitude) and _is_longitude(longitude)) or (radius_km is not None and radius_km <= 0):
+        return None
+    return SpatialQuery(kind=kind, latitude=latitude, longitude=longitude, radius_km=radius_km)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Returns the great-circle distance of two WGS84 coordinates in kilometres.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex(Generic[T]):
+    """
+    A uniform grid over latitude and longitude.
+
+    Every item is stored in the cell of its coordinates, so a bounding box
+    query only visits the cells overlapping the box. This is as fast as an
+    R-tree for points spread over the globe and needs no extra dependency.
+    """
+
+    def __init__(self, points: Iterable[tuple[float, float, T]], cell_degrees: float = GRID_CELL_DEGREES):
+        self.cell_degrees = cell_degrees
+        self._cells: dict[tuple[int, int], list[tuple[float, float, T]]] = {}
+        self._size = 0
+        for latitude, longitude, item in points:
+            self._cells.setdefault(self._cell(latitude, longitude), []).append((latitude, longitude, item))
+            self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def within(self, south: float, west: float, north: float, east: float) -> Iterator[tuple[float, float, T]]:
+        """
+        Yields all points inside the box. If west > east, the box crosses the
+        antimeridian.
+        """
+        if west > east:
+            yield from self.within(south, west, north, 180.0)
+            yield from self.within(south, -180.0, north, east)
+            return
+
+        min_row, min_column = self._cell(south, west)
+        max_row, max_column = self._cell(north, east)
+        if (max_row - min_row + 1) * (max_column - min_column + 1) > len(self._cells):
+            # a large box, visiting the occupied cells is cheaper
+            cells = (
+                points
+                for (row, column), points in self._cells.items()
+                if min_row <= row <= max_row and min_column <= column <= max_column
+            )
+        else:
+            cells = (
+                self._cells.get((row, column), ())
+                for row in range(min_row, max_row + 1)
+                for column in range(min_column, max_column + 1)
+            )
+
+        for points in cells:
+            for latitude, longitude, item in points:
+                if south <= latitude <= north and west <= longitude <= east:
+                    yield latitude, longitude, item
+
+    def nearest(self, latitude: float, longitude: float, radius_km: float | None = None) -> Iterator[tuple[float, T]]:
+        """
+        Yields (distance in km, item) pairs ordered by their distance,
+        optionally only those within `radius_km`. The points are ordered
+        lazily, so taking the first few of them is cheap.
+        """
+        if radius_km is None:
+            candidates = (point for points in self._cells.values() for point in points)
+        else:
+            candidates = self.within(*_radius_box(latitude, longitude, radius_km))
+
+        distances = [
+            (haversine_km(latitude, longitude, point_latitude, point_longitude), index, item)
+            for index, (point_latitude, point_longitude, item) in enumerate(candidates)
+        ]
+        if radius_km is not None:
+            distances = [distance for distance in distances if distance[0] <= radius_km]
+
+        heapq.heapify(distances)
+        while distances:
+            distance, _, item = heapq.heappop(distances)
+            yield distance, item
+
+    def _cell(self, latitude: float, longitude: float) -> tuple[int, int]:
+        return math.floor(latitude / self.cell_degrees), math.floor(longitude / self.cell_degrees)
+
+
+def _radius_box(latitude: float, longitude: float, radius_km: float) -> tuple[float, float, float, float]:
+    d_latitude = radius_km / KM_PER_DEGREE
+    south, north = max(-90.0, latitude - d_latitude), min(90.0, latitude + d_latitude)
+    cos_latitude = math.cos(math.radians(max(abs(south), abs(north))))
+    if north >= 90.0 or south <= -90.0 or cos_latitude <= 0 or d_latitude / cos_latitude >= 180.0:
+        return south, -180.0, north, 180.0
+
+    d_longitude = d_latitude / cos_latitude
+    west, east = longitude - d_longitude, longitude + d_longitude
+    if west < -180.0:
+        west += 360.0
+    if east > 180.0:
+        east -= 360.0
+    return south, west, north, east
+
+
+def _is_latitude(value: float) -> bool:
+    return -90.0 <= value <= 90.0
+
+
+def _is_longitude(value: float) -> bool:
+    return -180.0 <= value <= 180.0